@@ -9,67 +9,86 @@ Features:
 - Support for both .xlsx and .xls formats
 """
 
+import functools
+import hashlib
+import io
+import itertools
 import json
+import multiprocessing
 import os
+import random
 import re
+import shutil
+import string
+import threading
 import time
 import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any
+from typing import Any, BinaryIO
 
 import boto3
-from botocore.exceptions import ClientError
+import orjson
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from openpyxl import load_workbook
-from openpyxl.cell.cell import Cell
-
-# For .xls support
-import xlrd
 from openpyxl import Workbook
 
 logger = Logger()
 
-# Translation cache to avoid duplicate API calls
-translation_cache: dict[str, str] = {}
+# Translation cache to avoid duplicate API calls, one {text: translation} dict per language pair
+translation_cache: dict[tuple[str, str], dict[str, str]] = {}
+TRANSLATION_CACHE_MAX_ENTRIES = 50000  # per language pair
+
+
+def convert_xls_value(value: Any, ctype: int, datemode: int) -> Any:
+    """Map an xlrd cell value to the value openpyxl should store"""
+    import xlrd  # Already loaded by convert_xls_to_xlsx
+
+    if ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate.xldate_as_datetime(value, datemode)
+        except Exception:
+            return value
+    if ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    if ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    return value
 
 
-def convert_xls_to_xlsx(xls_path: str, xlsx_path: str) -> None:
+def convert_xls_to_xlsx(xls_data: bytes, xlsx_file: BinaryIO) -> None:
     """
-    Convert .xls file to .xlsx format.
+    Convert .xls file contents to .xlsx format, writing to a file-like object.
     Note: Some advanced formatting may not be preserved.
     """
-    xls_book = xlrd.open_workbook(xls_path, formatting_info=False)
-    xlsx_book = Workbook()
+    # xlrd is only needed for .xls inputs, so keep it out of the cold start of every invocation
+    import xlrd
 
-    # Remove default sheet
-    if "Sheet" in xlsx_book.sheetnames:
-        del xlsx_book["Sheet"]
+    # xlrd cell types whose values openpyxl can store unchanged
+    plain_cell_types = frozenset((xlrd.XL_CELL_TEXT, xlrd.XL_CELL_NUMBER))
+
+    xls_book = xlrd.open_workbook(file_contents=xls_data, formatting_info=False)
+    # Write-only mode streams rows out instead of building a Cell grid
+    xlsx_book = Workbook(write_only=True)
 
     for sheet_idx in range(xls_book.nsheets):
         xls_sheet = xls_book.sheet_by_index(sheet_idx)
         xlsx_sheet = xlsx_book.create_sheet(title=xls_sheet.name)
 
         for row_idx in range(xls_sheet.nrows):
-            for col_idx in range(xls_sheet.ncols):
-                cell = xls_sheet.cell(row_idx, col_idx)
-                value = cell.value
-
-                # Handle different cell types
-                if cell.ctype == xlrd.XL_CELL_DATE:
-                    try:
-                        value = xlrd.xldate.xldate_as_datetime(cell.value, xls_book.datemode)
-                    except Exception:
-                        pass
-                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
-                    value = bool(cell.value)
-                elif cell.ctype == xlrd.XL_CELL_ERROR:
-                    value = None
+            # Text and numbers are copied as-is; only the other cell types need converting
+            values = xls_sheet.row_values(row_idx)
+            for col_idx, ctype in enumerate(xls_sheet.row_types(row_idx)):
+                if ctype not in plain_cell_types:
+                    values[col_idx] = convert_xls_value(values[col_idx], ctype, xls_book.datemode)
+            xlsx_sheet.append(values)
 
-                xlsx_sheet.cell(row=row_idx + 1, column=col_idx + 1, value=value)
-
-    xlsx_book.save(xlsx_path)
-    logger.info(f"Converted .xls to .xlsx: {xls_path} -> {xlsx_path}")
+    xlsx_book.save(xlsx_file)
+    logger.info(f"Converted .xls to .xlsx ({xls_book.nsheets} sheets)")
 
 
 def is_xls_file(filename: str) -> bool:
@@ -77,35 +96,152 @@ def is_xls_file(filename: str) -> bool:
     return filename.lower().endswith(".xls") and not filename.lower().endswith(".xlsx")
 
 
-s3_client = boto3.client("s3")
-dynamodb_client = boto3.client("dynamodb")
-bedrock_client = boto3.client("bedrock-runtime", region_name=os.environ.get("MODEL_REGION", "us-east-1"))
+# Shared by all clients: TCP keepalive keeps pooled connections usable across the long pauses
+# between calls, and standard retry mode backs off with jitter
+AWS_CLIENT_CONFIG = Config(tcp_keepalive=True, retries={"max_attempts": 5, "mode": "standard"})
+
+s3_client = boto3.client("s3", config=AWS_CLIENT_CONFIG)
+# Adaptive retry mode backs off on throttling with a client-side rate limiter shared by all threads.
+# A full 16k-token response can take minutes to generate, hence the long read timeout.
+bedrock_client = boto3.client(
+    "bedrock-runtime",
+    region_name=os.environ.get("MODEL_REGION", "us-east-1"),
+    config=AWS_CLIENT_CONFIG.merge(
+        Config(
+            retries={"max_attempts": 8, "mode": "adaptive"},
+            connect_timeout=5,
+            read_timeout=300,
+            max_pool_connections=32,
+        )
+    ),
+)
+
+# Files are streamed through memory; multipart with parallel parts for large workbooks
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    io_chunksize=1024 * 1024,
+)
 
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "")
 MODEL_ID = os.environ.get("MODEL_ID", "us.anthropic.claude-3-5-haiku-20241022-v1:0")
 JOB_TABLE_NAME = os.environ.get("JOB_TABLE_NAME", "")
+dynamodb = boto3.resource("dynamodb", config=AWS_CLIENT_CONFIG)
+job_table = dynamodb.Table(JOB_TABLE_NAME)
+# Intermediate progress writes are not retried; a newer update follows shortly anyway
+progress_table = boto3.resource(
+    "dynamodb", config=AWS_CLIENT_CONFIG.merge(Config(retries={"total_max_attempts": 1, "mode": "standard"}))
+).Table(JOB_TABLE_NAME)
+
+# Translations shared across containers and jobs (optional); translation_cache stays in front of it
+TRANSLATION_CACHE_TABLE_NAME = os.environ.get("TRANSLATION_CACHE_TABLE_NAME", "")
+TRANSLATION_CACHE_TTL = 30 * 24 * 60 * 60  # seconds
+# Unprocessed cache keys are retried with capped, jittered exponential backoff, then treated as misses
+TRANSLATION_CACHE_READ_ATTEMPTS = 4
+TRANSLATION_CACHE_BACKOFF_BASE = 0.05  # seconds
+TRANSLATION_CACHE_BACKOFF_MAX = 1.0  # seconds
+
+# Extra converse() arguments shared by every Bedrock call.
+# Latency-optimized inference is only offered for some models and regions
+# (e.g. Claude 3.5 Haiku in us-east-2 via cross-region inference), so it is opt-in.
+CONVERSE_EXTRA_ARGS: dict[str, Any] = {}
+if os.environ.get("BEDROCK_LATENCY_OPTIMIZED") == "1":
+    CONVERSE_EXTRA_ARGS["performanceConfig"] = {"latency": "optimized"}
+
+# Static instructions for batch translation. They are identical for every request, so they
+# go in the system prompt where Bedrock prompt caching can reuse them (BEDROCK_PROMPT_CACHING=1).
+BATCH_TRANSLATION_RULES = """You translate texts extracted from spreadsheet cells.
+
+The input is a JSON object mapping ids to source texts.
+
+IMPORTANT RULES:
+- Return ONLY a valid JSON object mapping every input id to its translation
+- Keep the ids exactly as given
+- Preserve numbers, special characters, and formatting
+- If text contains only numbers/symbols, return as-is
+
+Output format (JSON object only, no other text):
+{"0": "...", "1": "...", ...}"""
+
+BATCH_SYSTEM_PROMPT: list[dict[str, Any]] = [{"text": BATCH_TRANSLATION_RULES}]
+if os.environ.get("BEDROCK_PROMPT_CACHING") == "1":
+    BATCH_SYSTEM_PROMPT.append({"cachePoint": {"type": "default"}})
+
+# One "id": "translation" pair of the batch response, used when the JSON is malformed
+BATCH_ITEM_RE = re.compile(r'"(\d+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Batch packing: texts per converse call are limited by estimated tokens (input + 2x output)
+BATCH_TOKEN_BUDGET = 6000
+BATCH_MAX_TEXTS = 100
+BATCH_ITEM_OVERHEAD_TOKENS = 10  # JSON id/field wrapping per item
+# maxTokens is reserved against the tokens-per-minute quota, so size it to the expected output
+BATCH_MIN_OUTPUT_TOKENS = 1024
+BATCH_MAX_OUTPUT_TOKENS = 16384
+
+# Upper bound on in-flight Bedrock requests; size it to stay under the account's RPM quota
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("MAX_CONCURRENT_REQUESTS", "8"))
+bedrock_semaphore = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Sheets of larger workbooks are scanned in forked processes, one per vCPU (openpyxl parsing is GIL-bound).
+# Workers end up copying the inherited workbook pages, and Lambda reports 2 CPUs even at small memory sizes,
+# so by default only functions with 2 full vCPUs (1769 MB and up) fork
+SCAN_MIN_MEMORY_MB = 1769
+LAMBDA_MEMORY_MB = int(os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "0"))
+SCAN_PROCESSES = int(
+    os.environ.get("SCAN_PROCESSES", str(os.cpu_count() or 1) if LAMBDA_MEMORY_MB >= SCAN_MIN_MEMORY_MB else "1")
+)
+SCAN_PARALLEL_MIN_BYTES = 1024 * 1024
+
+# Minimum seconds between DynamoDB progress writes while translating
+PROGRESS_UPDATE_INTERVAL = 2.0
+
+# Source languages written in non-Latin scripts (ASCII-only cells have nothing to translate)
+NON_LATIN_SOURCE_LANGUAGES = {"Japanese", "Chinese", "Korean"}
+
+# Values that never need translation, checked with a single precompiled match per text.
+# Only values containing letters get here (plain numbers, numeric dates and currency amounts are
+# already skipped by the no-letter check), so just those patterns remain, literal prefixes first
+SKIP_TEXT_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            r"/",  # Unix file paths
+            r"(?i:https?://)",  # URLs
+            r"[A-Za-z]:\\",  # Windows file paths
+            r"\d{4}年\d{1,2}月\d{1,2}日$",  # 2024年1月15日
+            r"\d{1,2}:\d{2}(?::\d{2})?\s*[APap][Mm]$",  # Times with AM/PM
+            r"[\d,]+\.?\d*\s*円$",  # Yen amounts
+            r"[\w\.-]+@[\w\.-]+\.\w+$",  # Email addresses
+        )
+    )
+)
+# Every SKIP_TEXT_RE pattern needs one of these characters, so text without them skips the match
+SKIP_TEXT_RE_CHARS = frozenset("/:年円@")
+# Letters, digits, common punctuation and any whitespace (including e.g. the ideographic space);
+# a set lookup per character is cheaper than matching a character-class regex
+ASCII_TEXT_CHARS = frozenset(string.ascii_letters + string.digits + ".,;:!?'\"()-_@#$%&*+=/<>\\|{}[]`~") | {
+    chr(c) for c in range(0x3001) if chr(c).isspace()
+}
+IDENTIFIER_RE = re.compile(r"[A-Z][A-Za-z0-9_]+$|[a-z_][a-z0-9_]*$")  # CamelCase / snake_case
 
 
 def update_job_status(job_id: str, status: str, **kwargs) -> None:
-    """Update job status in DynamoDB"""
+    """Update job status in DynamoDB (dicts are stored as native maps, ints as numbers)"""
     if not JOB_TABLE_NAME or not job_id:
         return
 
     update_expr = "SET #status = :status"
     expr_names = {"#status": "status"}
-    expr_values = {":status": {"S": status}}
+    expr_values: dict[str, Any] = {":status": status}
 
     for key, value in kwargs.items():
         update_expr += f", {key} = :{key}"
-        if isinstance(value, dict):
-            expr_values[f":{key}"] = {"S": json.dumps(value)}
-        else:
-            expr_values[f":{key}"] = {"S": str(value)}
+        expr_values[f":{key}"] = value
 
     try:
-        dynamodb_client.update_item(
-            TableName=JOB_TABLE_NAME,
-            Key={"jobId": {"S": job_id}},
+        job_table.update_item(
+            Key={"jobId": job_id},
             UpdateExpression=update_expr,
             ExpressionAttributeNames=expr_names,
             ExpressionAttributeValues=expr_values,
@@ -114,6 +250,97 @@ def update_job_status(job_id: str, status: str, **kwargs) -> None:
         logger.warning(f"Failed to update job status: {e}")
 
 
+def update_job_progress(job_id: str, **fields) -> None:
+    """Update individual fields of the existing progress map in place (best effort, dropped on error)"""
+    if not JOB_TABLE_NAME or not job_id:
+        return
+
+    try:
+        progress_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="SET " + ", ".join(f"#progress.#{key} = :{key}" for key in fields),
+            ExpressionAttributeNames={"#progress": "progress", **{f"#{key}": key for key in fields}},
+            ExpressionAttributeValues={f":{key}": value for key, value in fields.items()},
+        )
+    except Exception as e:
+        logger.warning(f"Failed to update job progress: {e}")
+
+
+def trim_translation_cache() -> None:
+    """Drop the oldest in-memory translations so the cache stays bounded across warm invocations"""
+    for language_cache in translation_cache.values():
+        excess = len(language_cache) - TRANSLATION_CACHE_MAX_ENTRIES
+        if excess > 0:
+            # Dicts keep insertion order, so the first keys are the oldest entries
+            for text in list(itertools.islice(language_cache, excess)):
+                del language_cache[text]
+
+
+def get_language_cache(source_lang: str, target_lang: str) -> dict[str, str]:
+    """In-memory translations for a language pair, keyed by the source text itself"""
+    return translation_cache.setdefault((source_lang, target_lang), {})
+
+
+def translation_cache_key(text: str, source_lang: str, target_lang: str) -> str:
+    """Key of a translation in the shared DynamoDB cache"""
+    return hashlib.sha256(f"{source_lang}:{target_lang}:{text}".encode()).hexdigest()
+
+
+def load_shared_translations(texts: list[str], source_lang: str, target_lang: str) -> dict[str, str]:
+    """Look up texts in the shared translation cache with BatchGetItem (100 keys per request)"""
+    if not TRANSLATION_CACHE_TABLE_NAME or not texts:
+        return {}
+
+    texts_by_key = {translation_cache_key(text, source_lang, target_lang): text for text in texts}
+    keys = list(texts_by_key)
+    found = {}
+    try:
+        for i in range(0, len(keys), 100):
+            request = {
+                TRANSLATION_CACHE_TABLE_NAME: {
+                    "Keys": [{"cacheKey": key} for key in keys[i : i + 100]],
+                    "ProjectionExpression": "cacheKey, translation",
+                }
+            }
+            for attempt in range(TRANSLATION_CACHE_READ_ATTEMPTS):
+                if attempt:
+                    # Full jitter over the capped exponential delay, so throttled readers spread out
+                    delay = min(TRANSLATION_CACHE_BACKOFF_MAX, TRANSLATION_CACHE_BACKOFF_BASE * 2**attempt)
+                    time.sleep(random.uniform(0, delay))
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for item in response["Responses"].get(TRANSLATION_CACHE_TABLE_NAME, []):
+                    found[texts_by_key[item["cacheKey"]]] = item["translation"]
+                request = response.get("UnprocessedKeys")
+                if not request:
+                    break
+            else:
+                unprocessed = len(request[TRANSLATION_CACHE_TABLE_NAME]["Keys"])
+                logger.warning(f"Treating {unprocessed} unprocessed shared cache keys as misses")
+    except Exception as e:
+        logger.warning(f"Failed to read shared translation cache: {e}")
+    return found
+
+
+def store_shared_translations(translations: dict[str, str], source_lang: str, target_lang: str) -> None:
+    """Write translations to the shared translation cache with BatchWriteItem"""
+    if not TRANSLATION_CACHE_TABLE_NAME or not translations:
+        return
+
+    expires_at = int(time.time()) + TRANSLATION_CACHE_TTL
+    try:
+        with dynamodb.Table(TRANSLATION_CACHE_TABLE_NAME).batch_writer(overwrite_by_pkeys=["cacheKey"]) as batch:
+            for text, translated in translations.items():
+                batch.put_item(
+                    Item={
+                        "cacheKey": translation_cache_key(text, source_lang, target_lang),
+                        "translation": translated,
+                        "ttl": expires_at,
+                    }
+                )
+    except Exception as e:
+        logger.warning(f"Failed to write shared translation cache: {e}")
+
+
 def bulk_translate_unique_texts(
     unique_texts: list[str],
     source_lang: str,
@@ -127,6 +354,8 @@ def bulk_translate_unique_texts(
 
     This is much more efficient than translating cell by cell:
     - 687 cells with 200 unique texts = 2-3 API calls instead of 28
+
+    Batches are sent concurrently, bounded by MAX_CONCURRENT_REQUESTS.
     """
     if not unique_texts:
         return {}
@@ -135,175 +364,227 @@ def bulk_translate_unique_texts(
     texts_to_translate = []
 
     # Check cache first
+    language_cache = get_language_cache(source_lang, target_lang)
     for text in unique_texts:
-        cache_key = f"{source_lang}:{target_lang}:{text}"
-        if cache_key in translation_cache:
-            translations[text] = translation_cache[cache_key]
+        if text in language_cache:
+            translations[text] = language_cache[text]
         else:
             texts_to_translate.append(text)
 
+    # Then the shared cache, which survives container recycling and is shared by all jobs
+    shared_translations = load_shared_translations(texts_to_translate, source_lang, target_lang)
+    for text, translated in shared_translations.items():
+        language_cache[text] = translated
+    translations.update(shared_translations)
+    texts_to_translate = [text for text in texts_to_translate if text not in shared_translations]
+
     if translations:
         logger.info(f"Cache hits: {len(translations)}/{len(unique_texts)} unique texts")
 
     if not texts_to_translate:
         return translations
 
-    # Large batch size for efficiency - Claude can handle 100+ texts easily
-    BATCH_SIZE = 100
-    max_retries = 5
-    total_batches = (len(texts_to_translate) + BATCH_SIZE - 1) // BATCH_SIZE
+    batches = pack_batches(texts_to_translate)
+    total_batches = len(batches)
 
     logger.info(f"Translating {len(texts_to_translate)} unique texts in {total_batches} batches")
 
-    for batch_idx in range(0, len(texts_to_translate), BATCH_SIZE):
-        batch = texts_to_translate[batch_idx : batch_idx + BATCH_SIZE]
-        batch_num = batch_idx // BATCH_SIZE + 1
+    # Batches are independent, so run them concurrently; throttling is handled per call.
+    # Progress and shared-cache writes go through a single background worker so DynamoDB
+    # latency never blocks result handling; progress is throttled to one per PROGRESS_UPDATE_INTERVAL.
+    completed_batches = 0
+    last_progress_update = 0.0
+    # The caller's "translating" status write created the progress map; the first throttled
+    # update (right after the first batch) adds the counters to it
+    report_progress = bool(job_id) and total_cells > 0
+    with (
+        ThreadPoolExecutor(max_workers=1) as progress_executor,
+        ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor,
+    ):
+        futures = {
+            executor.submit(translate_batch, batch, source_lang, target_lang): batch for batch in batches
+        }
+        for future in as_completed(futures):
+            batch_translations = future.result()
+            for original_text, translated in batch_translations.items():
+                translations[original_text] = translated
+                language_cache[original_text] = translated
+            # Failed fallback calls return the source text, so keep those out of the shared cache
+            progress_executor.submit(
+                store_shared_translations,
+                {text: translated for text, translated in batch_translations.items() if translated != text},
+                source_lang,
+                target_lang,
+            )
+            completed_batches += 1
+            logger.info(f"Translated batch {completed_batches}/{total_batches} ({len(futures[future])} texts)")
+
+            # Update progress
+            now = time.monotonic()
+            is_last_batch = completed_batches == total_batches
+            if report_progress and (is_last_batch or now - last_progress_update >= PROGRESS_UPDATE_INTERVAL):
+                last_progress_update = now
+                translated_count = len(translations)
+                progress_executor.submit(
+                    update_job_progress,
+                    job_id,
+                    unique_translated=translated_count,
+                    batch_progress=f"{completed_batches}/{total_batches}",
+                    percent=int(translated_count / len(unique_texts) * 100),
+                )
 
-        # Create JSON input for structured translation
-        input_data = [{"id": i, "text": text} for i, text in enumerate(batch)]
+    return translations
 
-        prompt = f"""Translate the following {source_lang} texts to {target_lang}.
 
-IMPORTANT RULES:
-- Return ONLY a valid JSON array with translations
-- Each item must have "id" (same as input) and "translation" fields
-- Preserve numbers, special characters, and formatting
-- If text contains only numbers/symbols, return as-is
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~1 token per CJK character, ~3 ASCII characters per token"""
+    return len(text.encode("utf-8")) // 3 + 1
 
-Input:
-{json.dumps(input_data, ensure_ascii=False)}
 
-Output format (JSON array only, no other text):
-[{{"id": 0, "translation": "..."}}, {{"id": 1, "translation": "..."}}, ...]"""
+def estimate_max_tokens(texts: list[str]) -> int:
+    """maxTokens for a batch: ~2x the estimated input per item, within fixed bounds"""
+    estimate = sum(2 * (estimate_tokens(text) + BATCH_ITEM_OVERHEAD_TOKENS) for text in texts)
+    return min(BATCH_MAX_OUTPUT_TOKENS, max(BATCH_MIN_OUTPUT_TOKENS, estimate))
+
 
-        success = False
-        for attempt in range(max_retries):
+def pack_batches(texts: list[str]) -> list[list[str]]:
+    """
+    Greedily pack texts into batches sized by estimated tokens rather than a fixed count.
+    Many short cells share one request, while long cells get smaller batches so the
+    response stays well below maxTokens.
+    """
+    batches = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        # Input tokens plus ~2x for the translated output, including the JSON wrapping per item
+        tokens = 3 * (estimate_tokens(text) + BATCH_ITEM_OVERHEAD_TOKENS)
+        if current and (current_tokens + tokens > BATCH_TOKEN_BUDGET or len(current) >= BATCH_MAX_TEXTS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(result: str) -> Any:
+    """Parse the JSON object of a batch response, tolerating text the model appends after it"""
+    try:
+        return orjson.loads(result)
+    except orjson.JSONDecodeError:
+        # raw_decode ignores anything after the object; strict=False accepts raw newlines in strings
+        return json.JSONDecoder(strict=False).raw_decode(result)[0]
+
+
+def extract_batch_items(result: str) -> list[tuple[str, str]]:
+    """Pick out complete "id": "translation" pairs in one scan (e.g. from a truncated response)"""
+    items = []
+    for m in BATCH_ITEM_RE.finditer(result):
+        translated = m.group(2)
+        # Only strings with escapes need decoding; strict=False tolerates raw newlines
+        if "\\" in translated:
             try:
-                response = bedrock_client.converse(
-                    modelId=MODEL_ID,
-                    messages=[{"role": "user", "content": [{"text": prompt}]}],
-                    inferenceConfig={"maxTokens": 16384, "temperature": 0.1},
-                )
-                result = response["output"]["message"]["content"][0]["text"].strip()
-
-                # Parse JSON response
-                # Handle potential markdown code blocks
-                if result.startswith("```"):
-                    result = result.split("```")[1]
-                    if result.startswith("json"):
-                        result = result[4:]
-                    result = result.strip()
-
-                try:
-                    parsed = json.loads(result)
-                    for item in parsed:
-                        idx = item.get("id")
-                        translated = item.get("translation", "")
-                        if idx is not None and 0 <= idx < len(batch):
-                            original_text = batch[idx]
-                            translations[original_text] = translated
-                            # Store in cache
-                            cache_key = f"{source_lang}:{target_lang}:{original_text}"
-                            translation_cache[cache_key] = translated
-                except json.JSONDecodeError:
-                    # Fallback: try to parse line by line if JSON fails
-                    logger.warning("JSON parse failed, attempting line-by-line parse")
-                    for line in result.split("\n"):
-                        line = line.strip()
-                        if '"id"' in line and '"translation"' in line:
-                            try:
-                                item = json.loads(line.rstrip(","))
-                                idx = item.get("id")
-                                translated = item.get("translation", "")
-                                if idx is not None and 0 <= idx < len(batch):
-                                    original_text = batch[idx]
-                                    translations[original_text] = translated
-                                    cache_key = f"{source_lang}:{target_lang}:{original_text}"
-                                    translation_cache[cache_key] = translated
-                            except:
-                                continue
-
-                success = True
-                logger.info(f"Translated batch {batch_num}/{total_batches} ({len(batch)} texts)")
-                break
-
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "ThrottlingException":
-                    if attempt < max_retries - 1:
-                        wait_time = (2 ** (attempt + 1)) + (time.time() % 1)
-                        logger.info(f"Throttled, waiting {wait_time:.1f}s before retry {attempt + 2}/{max_retries}")
-                        time.sleep(wait_time)
-                        continue
-                logger.warning(f"Batch translation failed: {e}")
-                break
-            except Exception as e:
-                logger.warning(f"Batch translation failed: {e}")
-                break
-
-        # Fallback for any missing translations in this batch
-        if not success or any(text not in translations for text in batch):
-            missing = [t for t in batch if t not in translations]
-            if missing:
-                logger.info(f"Retrying {len(missing)} missing translations individually")
-                for text in missing:
-                    translated = translate_single_text(text, source_lang, target_lang)
-                    translations[text] = translated
-
-        # Update progress
-        if job_id and total_cells > 0:
-            translated_count = len(translations)
-            update_job_status(
-                job_id,
-                "PROCESSING",
-                progress=json.dumps({
-                    "phase": "translating_unique_texts",
-                    "unique_translated": translated_count,
-                    "unique_total": len(unique_texts),
-                    "batch_progress": f"{batch_num}/{total_batches}",
-                    "percent": int(translated_count / len(unique_texts) * 100),
-                }),
+                translated = json.loads(f'"{translated}"', strict=False)
+            except json.JSONDecodeError:
+                continue
+        items.append((m.group(1), translated))
+    return items
+
+
+def translate_batch(batch: list[str], source_lang: str, target_lang: str) -> dict[str, str]:
+    """
+    Translate one batch of texts with a single converse call.
+    Runs in a worker thread; texts missing from the response are retried individually.
+    Throttling retries are handled by the client's adaptive retry mode.
+    """
+    translations = {}
+
+    # Create JSON input for structured translation
+    input_data = {str(i): text for i, text in enumerate(batch)}
+
+    prompt = f"""Translate the following {source_lang} texts to {target_lang}.
+
+Input:
+{orjson.dumps(input_data).decode()}"""
+
+    try:
+        with bedrock_semaphore:
+            response = bedrock_client.converse(
+                modelId=MODEL_ID,
+                system=BATCH_SYSTEM_PROMPT,
+                messages=[
+                    {"role": "user", "content": [{"text": prompt}]},
+                    # Prefill the response so the model starts directly with the JSON object
+                    {"role": "assistant", "content": [{"text": "{"}]},
+                ],
+                inferenceConfig={"maxTokens": estimate_max_tokens(batch), "temperature": 0.1},
+                **CONVERSE_EXTRA_ARGS,
             )
+        result = "{" + response["output"]["message"]["content"][0]["text"]
+
+        cache_read_tokens = response.get("usage", {}).get("cacheReadInputTokens")
+        if cache_read_tokens:
+            logger.info(f"Prompt cache hit: {cache_read_tokens} input tokens read from cache")
+
+        try:
+            items = parse_batch_response(result).items()
+        except (json.JSONDecodeError, AttributeError):
+            logger.warning("JSON parse failed, extracting translations with regex")
+            items = extract_batch_items(result)
+
+        for key, translated in items:
+            idx = int(key) if str(key).isdigit() else -1
+            if 0 <= idx < len(batch) and isinstance(translated, str):
+                translations[batch[idx]] = translated
+    except Exception as e:
+        logger.warning(f"Batch translation failed: {e}")
 
-        # Small delay between batches to avoid throttling
-        if batch_idx + BATCH_SIZE < len(texts_to_translate):
-            time.sleep(0.5)
+    # Fallback for any missing translations in this batch
+    missing = [t for t in batch if t not in translations]
+    if missing:
+        logger.info(f"Retrying {len(missing)} missing translations individually")
+        for text in missing:
+            translations[text] = translate_single_text(text, source_lang, target_lang)
 
     return translations
 
 
-def translate_single_text(text: str, source_lang: str, target_lang: str, max_retries: int = 3) -> str:
+def translate_single_text(text: str, source_lang: str, target_lang: str) -> str:
     """Translate a single text as fallback"""
     if not text or not text.strip():
         return text
 
-    cache_key = f"{source_lang}:{target_lang}:{text}"
-    if cache_key in translation_cache:
-        return translation_cache[cache_key]
+    language_cache = get_language_cache(source_lang, target_lang)
+    if text in language_cache:
+        return language_cache[text]
 
     prompt = f"""Translate to {target_lang}. Output only the translation:
 {text}"""
 
-    for attempt in range(max_retries):
-        try:
+    try:
+        with bedrock_semaphore:
             response = bedrock_client.converse(
                 modelId=MODEL_ID,
                 messages=[{"role": "user", "content": [{"text": prompt}]}],
                 inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
+                **CONVERSE_EXTRA_ARGS,
             )
-            translated = response["output"]["message"]["content"][0]["text"].strip()
-            translation_cache[cache_key] = translated
-            return translated
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ThrottlingException" and attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
-                continue
-            return text
-        except:
-            return text
-
-    return text
+        translated = response["output"]["message"]["content"][0]["text"].strip()
+        language_cache[text] = translated
+        return translated
+    except Exception as e:
+        logger.warning(f"Single text translation failed: {e}")
+        return text
 
 
+# Pure function of the text; the cache lives as long as the warm container, so labels and
+# headers repeated across jobs are only checked once
+@functools.lru_cache(maxsize=65536)
 def should_skip_text(text: str) -> bool:
     """
     Check if text should be skipped from translation.
@@ -316,161 +597,228 @@ def should_skip_text(text: str) -> bool:
     if not text:
         return True
 
-    # Numbers only (including decimals, negatives, percentages, with spaces)
-    if re.match(r'^-?[\d,\s]+\.?\d*%?$', text):
+    # Symbols, punctuation and digits only (no letters). This single scan settles most numbers,
+    # dates, currency values and phone numbers before any regex runs.
+    if not any(map(str.isalpha, text)):
+        return True
+
+    # Dates with 年月日, times with AM/PM, URLs, emails, 円 values and file paths
+    if not SKIP_TEXT_RE_CHARS.isdisjoint(text) and SKIP_TEXT_RE.match(text):
         return True
 
-    # Date patterns (various formats)
-    date_patterns = [
-        r'^\d{4}[-/]\d{1,2}[-/]\d{1,2}$',  # 2024-01-15, 2024/01/15
-        r'^\d{1,2}[-/]\d{1,2}[-/]\d{4}$',  # 01-15-2024, 01/15/2024
-        r'^\d{1,2}[-/]\d{1,2}[-/]\d{2}$',  # 01-15-24, 01/15/24
-        r'^\d{4}年\d{1,2}月\d{1,2}日$',     # 2024年1月15日
-    ]
-    for pattern in date_patterns:
-        if re.match(pattern, text):
+    # English/ASCII only text (no need to translate if already in target language or code/identifiers)
+    if ASCII_TEXT_CHARS.issuperset(text):
+        # Short English text like "OK", "Yes", "ID", "No." - skip
+        if len(text.split()) <= 2:
+            return True
+        # Longer English text might need translation, but identifiers don't
+        if IDENTIFIER_RE.match(text):
             return True
 
-    # Time patterns
-    if re.match(r'^\d{1,2}:\d{2}(:\d{2})?(\s*[APap][Mm])?$', text):
-        return True
+    return False
 
-    # URLs
-    if re.match(r'^https?://', text, re.IGNORECASE):
-        return True
 
-    # Email addresses
-    if re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', text):
-        return True
+def is_text_value(value: str) -> bool:
+    """Check if a string cell value is non-blank, non-formula text"""
+    # Skip blank cells and formulas; isspace() avoids the copy strip() makes
+    return bool(value) and value[0] != "=" and not value.isspace()
 
-    # Phone numbers (various formats)
-    if re.match(r'^[\d\s\-\+\(\)]+$', text) and len(re.sub(r'\D', '', text)) >= 7:
-        return True
 
-    # Symbols and punctuation only (no letters)
-    if not any(c.isalpha() for c in text):
-        return True
+def scan_sheets(wb_scan: Workbook, sheet_indexes: list[int], skip_ascii: bool) -> list[tuple]:
+    """
+    Scan worksheets of a streaming read-only workbook for translatable text cells.
+    Returns one (sheet index, cell count, skipped text cells, rows, cols, texts) tuple per sheet.
+    """
+    results = []
+    # Cells repeat the same strings, so run the skip checks once per distinct text
+    skip_decisions: dict[str, bool] = {}
+
+    for sheet_id in sheet_indexes:
+        skipped = 0
+        rows = array("I")
+        cols = array("H")
+        texts: list[str] = []
+        sheet = wb_scan.worksheets[sheet_id]
+        # The declared dimension can be inflated (e.g. A1:XFD1048576), and iter_rows pads every row
+        # out to it; walk only the stored cells and size the grid from what was actually seen
+        sheet.reset_dimensions()
+        max_row = 0
+        max_col = 0
+        for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            if row:
+                max_row = row_idx
+                max_col = max(max_col, len(row))
+            for col_idx, value in enumerate(row, start=1):
+                # Most cells are empty or numeric; reject them before the full text checks
+                if not (isinstance(value, str) and is_text_value(value)):
+                    continue
+                skip = skip_decisions.get(value)
+                if skip is None:
+                    skip = skip_decisions[value] = (skip_ascii and value.isascii()) or should_skip_text(value)
+                if skip:
+                    skipped += 1
+                    continue
+                rows.append(row_idx)
+                cols.append(col_idx)
+                texts.append(value)
+        results.append((sheet_id, max_row * max_col, skipped, rows, cols, texts))
+
+    return results
+
+
+def scan_sheets_parallel(wb_scan: Workbook, skip_ascii: bool, processes: int) -> list[tuple]:
+    """
+    Scan sheets in forked processes, each taking every n-th sheet, and return the results in sheet order.
+    The children inherit the loaded workbook (shared strings included), so nothing is parsed twice.
+    Uses Process and Pipe because Lambda has no /dev/shm for the queues of multiprocessing.Pool.
+    """
+    sheet_count = len(wb_scan.worksheets)
+    context = multiprocessing.get_context("fork")
+    workers = []
+    for worker_idx in range(processes):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=scan_sheets_worker,
+            args=(wb_scan, list(range(worker_idx, sheet_count, processes)), skip_ascii, sender),
+        )
+        process.start()
+        sender.close()
+        workers.append((process, receiver))
 
-    # Currency values
-    if re.match(r'^[$€£¥₩]\s*[\d,]+\.?\d*$', text):
-        return True
-    if re.match(r'^[\d,]+\.?\d*\s*[$€£¥₩円]$', text):
-        return True
+    results = []
+    try:
+        for _, receiver in workers:
+            results.extend(receiver.recv())
+    finally:
+        for process, receiver in workers:
+            receiver.close()
+            process.join()
 
-    # English/ASCII only text (no need to translate if already in target language or code/identifiers)
-    # Skip if text contains only ASCII letters, numbers, and common punctuation
-    if re.match(r'^[A-Za-z0-9\s\.,;:!?\'"()\-_@#$%&*+=/<>\\|{}\[\]`~]+$', text):
-        # But don't skip if it's a meaningful English sentence (has spaces and multiple words)
-        words = text.split()
-        if len(words) <= 2:
-            # Short English text like "OK", "Yes", "ID", "No." - skip
-            return True
-        # Longer English text might need translation depending on context
-        # Skip common technical terms and identifiers
-        if re.match(r'^[A-Z][A-Za-z0-9_]+$', text):  # CamelCase identifiers
-            return True
-        if re.match(r'^[a-z_][a-z0-9_]*$', text):  # snake_case identifiers
-            return True
+    results.sort(key=lambda result: result[0])
+    return results
 
-    # File paths and technical identifiers
-    if re.match(r'^[A-Za-z]:\\', text) or text.startswith('/'):
-        return True
 
-    return False
+def scan_sheets_worker(wb_scan: Workbook, sheet_indexes: list[int], skip_ascii: bool, sender) -> None:
+    """Process entry point of scan_sheets_parallel; sends the scan results back to the parent"""
+    try:
+        sender.send(scan_sheets(wb_scan, sheet_indexes, skip_ascii))
+    finally:
+        sender.close()
 
 
-def is_translatable_cell(cell: Cell) -> bool:
-    """Check if a cell contains translatable text"""
-    if cell.value is None:
-        return False
-    if not isinstance(cell.value, str):
-        return False
-    if not cell.value.strip():
-        return False
-    # Skip cells that are formulas
-    if str(cell.value).startswith("="):
-        return False
-    # Skip cells that don't need translation
-    if should_skip_text(cell.value):
-        return False
-    return True
-
-
-def translate_excel(input_path: str, output_path: str, source_lang: str, target_lang: str, job_id: str = None) -> dict:
+def translate_excel(
+    input_file: BinaryIO, output_file: BinaryIO, source_lang: str, target_lang: str, job_id: str = None
+) -> dict:
     """
     Translate an Excel file while preserving all formatting.
 
     Uses unique text aggregation for efficiency:
     - Extract unique texts from ALL sheets
-    - Translate unique texts in large batches (100 per API call)
+    - Translate unique texts in large token-packed batches (up to 100 per API call)
     - Apply translations back to all cells
 
     This reduces API calls dramatically (e.g., 687 cells with 200 unique texts = 2-3 API calls)
     """
-    # Load workbook preserving all formatting
-    wb = load_workbook(input_path)
-
-    stats = {"total_cells": 0, "translated_cells": 0, "sheets_processed": 0, "total_sheets": len(wb.worksheets)}
-
-    # Phase 1: Collect ALL translatable cells and their texts from ALL sheets
+    # Phase 1: Collect ALL translatable cells and their texts from ALL sheets.
+    # Scanning only needs values, so use a streaming read-only workbook (no Cell objects/styles).
     logger.info("Phase 1: Collecting texts from all sheets...")
-    all_cells_info: list[tuple[str, str, str]] = []  # (sheet_name, coord, text)
-    unique_texts: set[str] = set()
+    # Cells are kept as parallel arrays (structure of arrays) indexing into the sheet list and
+    # the deduplicated text list, instead of one tuple per cell
+    sheet_ids = array("H")
+    rows = array("I")
+    cols = array("H")
+    text_ids = array("I")
+    unique_texts: list[str] = []
+    text_to_id: dict[str, int] = {}
     total_cell_count = 0
+    skipped_noop = 0
+    # ASCII-only text cannot contain a non-Latin source language, so it is already "translated"
+    skip_ascii = source_lang in NON_LATIN_SOURCE_LANGUAGES
+
+    input_size = input_file.seek(0, io.SEEK_END)
+    input_file.seek(0)
+    wb_scan = load_workbook(input_file, read_only=True)
+    total_sheets = len(wb_scan.worksheets)
+    processes = min(SCAN_PROCESSES, total_sheets)
+    scan_results = None
+    # Forked children would share the offset of a real file, so only in-memory input is scanned in parallel
+    if processes > 1 and input_size >= SCAN_PARALLEL_MIN_BYTES and isinstance(input_file, io.BytesIO):
+        try:
+            scan_results = scan_sheets_parallel(wb_scan, skip_ascii, processes)
+            logger.info(f"Scanned {total_sheets} sheets in {processes} processes")
+        except Exception as e:
+            logger.warning(f"Parallel sheet scan failed, scanning sequentially: {e}")
+    if scan_results is None:
+        scan_results = scan_sheets(wb_scan, list(range(total_sheets)), skip_ascii)
+    wb_scan.close()
+
+    for sheet_id, cell_count, skipped, sheet_rows, sheet_cols, texts in scan_results:
+        total_cell_count += cell_count
+        skipped_noop += skipped
+        for text in texts:
+            text_id = text_to_id.get(text)
+            if text_id is None:
+                text_id = text_to_id[text] = len(unique_texts)
+                unique_texts.append(text)
+            text_ids.append(text_id)
+        sheet_ids.extend([sheet_id] * len(texts))
+        rows.extend(sheet_rows)
+        cols.extend(sheet_cols)
+
+    total_translatable = len(text_ids)
+
+    stats = {
+        "total_cells": total_cell_count,
+        "translated_cells": 0,
+        "sheets_processed": 0,
+        "total_sheets": total_sheets,
+        "total_translatable": total_translatable,
+        "unique_texts": len(unique_texts),
+        "skipped_noop": skipped_noop,
+    }
 
-    for sheet in wb.worksheets:
-        for row in sheet.iter_rows():
-            for cell in row:
-                total_cell_count += 1
-                if is_translatable_cell(cell):
-                    text = cell.value
-                    all_cells_info.append((sheet.title, cell.coordinate, text))
-                    unique_texts.add(text)
-
-    stats["total_cells"] = total_cell_count
-    stats["total_translatable"] = len(all_cells_info)
-    stats["unique_texts"] = len(unique_texts)
-
-    logger.info(f"Found {len(all_cells_info)} translatable cells with {len(unique_texts)} unique texts")
-
-    if job_id:
-        update_job_status(
-            job_id,
-            "PROCESSING",
-            progress=json.dumps({
-                "phase": "collecting_texts",
-                "total_translatable": len(all_cells_info),
-                "unique_texts": len(unique_texts),
-                "percent": 5,
-            }),
-        )
+    logger.info(
+        f"Found {total_translatable} translatable cells with {len(unique_texts)} unique texts "
+        f"({skipped_noop} text cells skipped)"
+    )
 
     if not unique_texts:
         logger.info("No translatable text found")
-        wb.save(output_path)
+        input_file.seek(0)
+        shutil.copyfileobj(input_file, output_file)
         return stats
 
     # Phase 2: Translate all unique texts at once
     logger.info("Phase 2: Translating unique texts in batches...")
     if job_id:
+        # Collection results go out with the phase change, so there is one write between the phases
         update_job_status(
             job_id,
             "PROCESSING",
-            progress=json.dumps({
+            progress={
                 "phase": "translating",
+                "total_translatable": total_translatable,
                 "unique_texts": len(unique_texts),
                 "percent": 10,
-            }),
+            },
         )
 
     translations = bulk_translate_unique_texts(
-        list(unique_texts),
+        unique_texts,
         source_lang,
         target_lang,
         job_id,
-        len(all_cells_info),
+        total_translatable,
     )
 
+    # Resolve anything the batches missed once per unique text, before touching the workbook
+    missing = [text for text in unique_texts if text not in translations]
+    if missing:
+        logger.info(f"Translating {len(missing)} missing texts individually")
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(missing))) as executor:
+            fallback = executor.map(lambda text: translate_single_text(text, source_lang, target_lang), missing)
+            translations.update(zip(missing, fallback, strict=True))
+
     logger.info(f"Translated {len(translations)} unique texts")
 
     # Phase 3: Apply translations back to all cells
@@ -479,29 +827,27 @@ def translate_excel(input_path: str, output_path: str, source_lang: str, target_
         update_job_status(
             job_id,
             "PROCESSING",
-            progress=json.dumps({
+            progress={
                 "phase": "applying_translations",
                 "percent": 90,
-            }),
+            },
         )
 
-    translated_count = 0
-    for sheet_name, coord, original_text in all_cells_info:
-        sheet = wb[sheet_name]
-        if original_text in translations:
-            sheet[coord].value = translations[original_text]
-            translated_count += 1
-        else:
-            # Fallback: translate individually if not in cache
-            translated = translate_single_text(original_text, source_lang, target_lang)
-            sheet[coord].value = translated
-            translated_count += 1
+    # Load workbook preserving all formatting only for the write-back
+    input_file.seek(0)
+    wb = load_workbook(input_file)
+
+    translated_texts = [translations[text] for text in unique_texts]
+    worksheets = wb.worksheets
+    for sheet_id, row_idx, col_idx, text_id in zip(sheet_ids, rows, cols, text_ids, strict=True):
+        worksheets[sheet_id].cell(row=row_idx, column=col_idx).value = translated_texts[text_id]
+    translated_count = len(text_ids)
 
     stats["translated_cells"] = translated_count
     stats["sheets_processed"] = len(wb.worksheets)
 
     # Save the translated workbook
-    wb.save(output_path)
+    wb.save(output_file)
     logger.info(f"Saved translated workbook with {translated_count} translated cells")
 
     return stats
@@ -560,52 +906,44 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         filename = os.path.basename(s3_key)
         is_xls = is_xls_file(filename)
 
-        # Create temp file paths
-        unique_id = uuid.uuid4()
-        if is_xls:
-            tmp_download = f"/tmp/input_{unique_id}.xls"
-            tmp_input = f"/tmp/input_{unique_id}_converted.xlsx"
-        else:
-            tmp_download = f"/tmp/input_{unique_id}.xlsx"
-            tmp_input = tmp_download
-        tmp_output = f"/tmp/output_{unique_id}.xlsx"
-
-        # Download file from S3
-        s3_client.download_file(BUCKET_NAME, s3_key, tmp_download)
+        # Download file from S3 into memory
+        download_buffer = io.BytesIO()
+        s3_client.download_fileobj(BUCKET_NAME, s3_key, download_buffer, Config=S3_TRANSFER_CONFIG)
         logger.info(f"Downloaded file from S3: {s3_key}")
 
         # Convert .xls to .xlsx if necessary
         if is_xls:
-            convert_xls_to_xlsx(tmp_download, tmp_input)
+            input_buffer = io.BytesIO()
+            convert_xls_to_xlsx(download_buffer.getvalue(), input_buffer)
             logger.info(f"Converted .xls to .xlsx for processing")
+        else:
+            input_buffer = download_buffer
+        input_buffer.seek(0)
 
-        # Translate the Excel file
-        stats = translate_excel(tmp_input, tmp_output, source_lang, target_lang, job_id)
+        # Translate the Excel file (trimming first, as no worker threads touch the cache yet)
+        trim_translation_cache()
+        output_buffer = io.BytesIO()
+        stats = translate_excel(input_buffer, output_buffer, source_lang, target_lang, job_id)
         logger.info(f"Translation complete: {stats}")
 
         # Generate output S3 key (always output as .xlsx for compatibility)
         name, _ = os.path.splitext(filename)
         output_filename = f"{name}_translated.xlsx"
-        output_s3_key = f"translated/{uuid.uuid4()}/{output_filename}"
+        output_s3_key = f"translated/{uuid.uuid4().hex}/{output_filename}"
 
-        # Upload translated file to S3
-        s3_client.upload_file(tmp_output, BUCKET_NAME, output_s3_key)
-        logger.info(f"Uploaded translated file to S3: {output_s3_key}")
-
-        # Clean up temp files
-        if is_xls and os.path.exists(tmp_download):
-            os.remove(tmp_download)
-        if os.path.exists(tmp_input):
-            os.remove(tmp_input)
-        if os.path.exists(tmp_output):
-            os.remove(tmp_output)
-
-        # Generate presigned URL for download
+        # Presigning is local, so publish the download URL before the upload finishes
         presigned_url = s3_client.generate_presigned_url(
             "get_object",
             Params={"Bucket": BUCKET_NAME, "Key": output_s3_key},
             ExpiresIn=3600,  # 1 hour
         )
+        if job_id:
+            update_job_status(job_id, "UPLOADING", outputS3Key=output_s3_key, downloadUrl=presigned_url)
+
+        # Upload translated file to S3
+        output_buffer.seek(0)
+        s3_client.upload_fileobj(output_buffer, BUCKET_NAME, output_s3_key, Config=S3_TRANSFER_CONFIG)
+        logger.info(f"Uploaded translated file to S3: {output_s3_key}")
 
         # Update job status to COMPLETED
         if job_id:
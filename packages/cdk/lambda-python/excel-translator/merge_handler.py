@@ -9,49 +9,72 @@ This Lambda:
 5. Updates job status to COMPLETED
 """
 
-import json
+import base64
+import io
 import os
+import sys
+import threading
 import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Any, BinaryIO
 
 import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from openpyxl import load_workbook
-
-# For .xls support
-import xlrd
+from openpyxl.utils import get_column_letter
 from openpyxl import Workbook
 
 logger = Logger()
 
-s3_client = boto3.client("s3")
-dynamodb_client = boto3.client("dynamodb")
+# Shared by all clients: TCP keepalive keeps pooled connections usable across the long pauses
+# between calls, and standard retry mode backs off with jitter
+AWS_CLIENT_CONFIG = Config(tcp_keepalive=True, retries={"max_attempts": 5, "mode": "standard"})
+
+# Enough pooled connections for the multipart source download plus the parallel result reads
+s3_client = boto3.client("s3", config=AWS_CLIENT_CONFIG.merge(Config(max_pool_connections=32)))
 
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "")
 JOB_TABLE_NAME = os.environ.get("JOB_TABLE_NAME", "")
+job_table = boto3.resource("dynamodb", config=AWS_CLIENT_CONFIG).Table(JOB_TABLE_NAME)
+
+# Translation results fetched in parallel (the source workbook download runs alongside)
+MAX_S3_READ_CONCURRENCY = 16
+
+# Packed cell arrays are little-endian unsigned 32-bit integers, whatever the host platform
+PACKED_TYPECODE = "I"
+PACKED_ITEMSIZE = 4
+
+# Files are streamed through memory; multipart with parallel parts for large workbooks
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    io_chunksize=1024 * 1024,
+)
 
 
 def update_job_status(job_id: str, status: str, **kwargs) -> None:
-    """Update job status in DynamoDB"""
+    """Update job status in DynamoDB (dicts are stored as native maps, ints as numbers)"""
     if not JOB_TABLE_NAME or not job_id:
         return
 
     update_expr = "SET #status = :status"
     expr_names = {"#status": "status"}
-    expr_values = {":status": {"S": status}}
+    expr_values: dict[str, Any] = {":status": status}
 
     for key, value in kwargs.items():
         update_expr += f", {key} = :{key}"
-        if isinstance(value, dict):
-            expr_values[f":{key}"] = {"S": json.dumps(value)}
-        else:
-            expr_values[f":{key}"] = {"S": str(value)}
+        expr_values[f":{key}"] = value
 
     try:
-        dynamodb_client.update_item(
-            TableName=JOB_TABLE_NAME,
-            Key={"jobId": {"S": job_id}},
+        job_table.update_item(
+            Key={"jobId": job_id},
             UpdateExpression=update_expr,
             ExpressionAttributeNames=expr_names,
             ExpressionAttributeValues=expr_values,
@@ -60,36 +83,47 @@ def update_job_status(job_id: str, status: str, **kwargs) -> None:
         logger.warning(f"Failed to update job status: {e}")
 
 
-def convert_xls_to_xlsx(xls_path: str, xlsx_path: str) -> None:
-    """Convert .xls file to .xlsx format."""
-    xls_book = xlrd.open_workbook(xls_path, formatting_info=False)
-    xlsx_book = Workbook()
+def convert_xls_value(value: Any, ctype: int, datemode: int) -> Any:
+    """Map an xlrd cell value to the value openpyxl should store"""
+    import xlrd  # Already loaded by convert_xls_to_xlsx
+
+    if ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate.xldate_as_datetime(value, datemode)
+        except Exception:
+            return value
+    if ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    if ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    return value
+
+
+def convert_xls_to_xlsx(xls_data: bytes, xlsx_file: BinaryIO) -> None:
+    """Convert .xls file contents to .xlsx format, writing to a file-like object."""
+    # xlrd is only needed for .xls inputs, so keep it out of the cold start of every invocation
+    import xlrd
 
-    if "Sheet" in xlsx_book.sheetnames:
-        del xlsx_book["Sheet"]
+    # xlrd cell types whose values openpyxl can store unchanged
+    plain_cell_types = frozenset((xlrd.XL_CELL_TEXT, xlrd.XL_CELL_NUMBER))
+
+    xls_book = xlrd.open_workbook(file_contents=xls_data, formatting_info=False)
+    # Write-only mode streams rows out instead of building a Cell grid
+    xlsx_book = Workbook(write_only=True)
 
     for sheet_idx in range(xls_book.nsheets):
         xls_sheet = xls_book.sheet_by_index(sheet_idx)
         xlsx_sheet = xlsx_book.create_sheet(title=xls_sheet.name)
 
         for row_idx in range(xls_sheet.nrows):
-            for col_idx in range(xls_sheet.ncols):
-                cell = xls_sheet.cell(row_idx, col_idx)
-                value = cell.value
-
-                if cell.ctype == xlrd.XL_CELL_DATE:
-                    try:
-                        value = xlrd.xldate.xldate_as_datetime(cell.value, xls_book.datemode)
-                    except Exception:
-                        pass
-                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
-                    value = bool(cell.value)
-                elif cell.ctype == xlrd.XL_CELL_ERROR:
-                    value = None
+            # Text and numbers are copied as-is; only the other cell types need converting
+            values = xls_sheet.row_values(row_idx)
+            for col_idx, ctype in enumerate(xls_sheet.row_types(row_idx)):
+                if ctype not in plain_cell_types:
+                    values[col_idx] = convert_xls_value(values[col_idx], ctype, xls_book.datemode)
+            xlsx_sheet.append(values)
 
-                xlsx_sheet.cell(row=row_idx + 1, column=col_idx + 1, value=value)
-
-    xlsx_book.save(xlsx_path)
+    xlsx_book.save(xlsx_file)
 
 
 def is_xls_file(filename: str) -> bool:
@@ -97,16 +131,80 @@ def is_xls_file(filename: str) -> bool:
     return filename.lower().endswith(".xls") and not filename.lower().endswith(".xlsx")
 
 
+def load_source_workbook(s3_key: str) -> Workbook:
+    """Download the original file into memory and load it as an .xlsx workbook"""
+    download_buffer = io.BytesIO()
+    s3_client.download_fileobj(BUCKET_NAME, s3_key, download_buffer, Config=S3_TRANSFER_CONFIG)
+
+    if is_xls_file(s3_key):
+        input_buffer = io.BytesIO()
+        convert_xls_to_xlsx(download_buffer.getvalue(), input_buffer)
+    else:
+        input_buffer = download_buffer
+    input_buffer.seek(0)
+
+    return load_workbook(input_buffer)
+
+
+def load_work_data(work_data_key: str) -> dict:
+    """Load the cell list written by the prepare step"""
+    response = s3_client.get_object(Bucket=BUCKET_NAME, Key=work_data_key)
+    return orjson.loads(response["Body"].read())
+
+
+def load_translations(translation_key: str) -> dict[str, str]:
+    """Load the translations stored by one batch"""
+    response = s3_client.get_object(Bucket=BUCKET_NAME, Key=translation_key)
+    return orjson.loads(response["Body"].read()).get("translations", {})
+
+
+def unpack_array(data: str) -> array:
+    """Inverse of the prepare step's pack_array: little-endian unsigned 32-bit integers"""
+    raw = base64.b64decode(data)
+    values = array(PACKED_TYPECODE)
+    if values.itemsize != PACKED_ITEMSIZE or len(raw) % PACKED_ITEMSIZE:
+        raise ValueError(f"Packed cell array is not a sequence of {PACKED_ITEMSIZE}-byte integers")
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def apply_translations(wb: Workbook, work_data: dict, translations: dict[str, str]) -> int:
+    """Write translations into the cells listed in the work data and return how many were applied"""
+    # Resolve each unique text once; cells then only index the result by their text id.
+    # Cells are addressed by row/column, so no A1 coordinate is parsed per cell.
+    translated_texts = [translations.get(text) for text in work_data.get("texts", [])]
+    translated_count = 0
+    for sheet, cells in zip(wb.worksheets, work_data.get("sheets", []), strict=True):
+        rows = unpack_array(cells["rows"])
+        cols = unpack_array(cells["cols"])
+        text_ids = unpack_array(cells["textIds"])
+        for row, col, text_id in zip(rows, cols, text_ids, strict=True):
+            translated = translated_texts[text_id]
+            if translated is None:
+                continue
+            try:
+                sheet.cell(row=row, column=col).value = translated
+                translated_count += 1
+            except Exception as e:
+                logger.warning(f"Failed to apply translation to {sheet.title}!{get_column_letter(col)}{row}: {e}")
+    return translated_count
+
+
 def cleanup_work_data(job_id: str) -> None:
     """Clean up temporary work data from S3"""
     work_prefix = f"excel-work/{job_id}/"
     try:
-        response = s3_client.list_objects_v2(Bucket=BUCKET_NAME, Prefix=work_prefix)
-        if "Contents" in response:
-            objects = [{"Key": obj["Key"]} for obj in response["Contents"]]
+        deleted = 0
+        # Pages hold at most 1000 keys, which is also the delete_objects limit
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=work_prefix):
+            objects = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
             if objects:
-                s3_client.delete_objects(Bucket=BUCKET_NAME, Delete={"Objects": objects})
-                logger.info(f"Cleaned up {len(objects)} work files")
+                s3_client.delete_objects(Bucket=BUCKET_NAME, Delete={"Objects": objects, "Quiet": True})
+                deleted += len(objects)
+        logger.info(f"Cleaned up {deleted} work files")
     except Exception as e:
         logger.warning(f"Failed to cleanup work data: {e}")
 
@@ -120,7 +218,8 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     {
         "jobId": "uuid",
         "s3Key": "uploads/xxx/file.xlsx",
-        "workDataKey": "excel-work/jobId/work_data.json",
+        "workDataKey": "excel-work/jobId/work_data.json",  # null when workData is inline
+        "workData": {...},  # the cell list for small jobs
         "translationResults": [
             {"batchId": 0, "translationKey": "...", "translatedCount": 100, "success": true},
             ...
@@ -139,106 +238,76 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     job_id = event.get("jobId")
     s3_key = event.get("s3Key")
     work_data_key = event.get("workDataKey")
+    work_data = event.get("workData")
     translation_results = event.get("translationResults", [])
     stats = event.get("stats", {})
 
     logger.info(f"Merging translations for job {job_id}")
 
-    update_job_status(
-        job_id,
-        "MERGING",
-        progress=json.dumps({
-            "phase": "merging",
-            "percent": 90
-        })
-    )
-
-    # Load work data
-    response = s3_client.get_object(Bucket=BUCKET_NAME, Key=work_data_key)
-    work_data = json.loads(response["Body"].read().decode("utf-8"))
-    cells = work_data.get("cells", [])
-
-    logger.info(f"Loaded work data with {len(cells)} cells to process")
-
-    # Load all translations
-    all_translations = {}
-    for result in translation_results:
-        if result.get("success"):
-            translation_key = result.get("translationKey")
-            try:
-                response = s3_client.get_object(Bucket=BUCKET_NAME, Key=translation_key)
-                data = json.loads(response["Body"].read().decode("utf-8"))
-                all_translations.update(data.get("translations", {}))
-            except Exception as e:
-                logger.warning(f"Failed to load translation {translation_key}: {e}")
-
-    logger.info(f"Loaded {len(all_translations)} translations from {len(translation_results)} batches")
-
-    # Download original file
+    # Download and parse the original workbook while the translation results are loaded
     filename = os.path.basename(s3_key)
-    is_xls = is_xls_file(filename)
-    unique_id = uuid.uuid4()
-
-    if is_xls:
-        tmp_download = f"/tmp/input_{unique_id}.xls"
-        tmp_input = f"/tmp/input_{unique_id}_converted.xlsx"
-    else:
-        tmp_download = f"/tmp/input_{unique_id}.xlsx"
-        tmp_input = tmp_download
-
-    tmp_output = f"/tmp/output_{unique_id}.xlsx"
-
-    s3_client.download_file(BUCKET_NAME, s3_key, tmp_download)
-
-    if is_xls:
-        convert_xls_to_xlsx(tmp_download, tmp_input)
-
-    # Load workbook and apply translations
-    wb = load_workbook(tmp_input)
-
-    translated_count = 0
-    for cell_info in cells:
-        sheet_name = cell_info.get("sheet")
-        coord = cell_info.get("coord")
-        original_text = cell_info.get("text")
-
-        if original_text in all_translations:
-            try:
-                wb[sheet_name][coord].value = all_translations[original_text]
-                translated_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to apply translation to {sheet_name}!{coord}: {e}")
+    with ThreadPoolExecutor(max_workers=1) as source_executor:
+        source_future = source_executor.submit(load_source_workbook, s3_key)
+
+        # Load work data and all translations concurrently; these are small objects, so latency dominates
+        all_translations = {}
+        translation_keys = [result.get("translationKey") for result in translation_results if result.get("success")]
+        with ThreadPoolExecutor(max_workers=min(MAX_S3_READ_CONCURRENCY, len(translation_keys) + 2)) as executor:
+            # The status write overlaps the reads instead of delaying them; it finishes before UPLOADING is set
+            executor.submit(update_job_status, job_id, "MERGING", progress={"phase": "merging", "percent": 90})
+            # Small jobs carry the work data inline
+            work_data_future = executor.submit(load_work_data, work_data_key) if work_data is None else None
+            futures = {executor.submit(load_translations, key): key for key in translation_keys}
+            for future in as_completed(futures):
+                try:
+                    all_translations.update(future.result())
+                except Exception as e:
+                    logger.warning(f"Failed to load translation {futures[future]}: {e}")
+            if work_data_future:
+                work_data = work_data_future.result()
+
+        logger.info(f"Loaded work data with {len(work_data.get('texts', []))} unique texts to apply")
+
+        logger.info(f"Loaded {len(all_translations)} translations from {len(translation_results)} batches")
+
+        # Apply translations to the workbook loaded in the background
+        wb = source_future.result()
+
+    translated_count = apply_translations(wb, work_data, all_translations)
 
     # Save translated workbook
-    wb.save(tmp_output)
+    output_buffer = io.BytesIO()
+    wb.save(output_buffer)
     logger.info(f"Applied {translated_count} translations to workbook")
 
+    # The Cell grid and the cell lists are the largest allocations here; release them before the upload
+    sheets_processed = len(wb.worksheets)
+    del wb, work_data
+
     # Upload to S3
     name, _ = os.path.splitext(filename)
     output_filename = f"{name}_translated.xlsx"
-    output_s3_key = f"translated/{uuid.uuid4()}/{output_filename}"
+    output_s3_key = f"translated/{uuid.uuid4().hex}/{output_filename}"
 
-    s3_client.upload_file(tmp_output, BUCKET_NAME, output_s3_key)
-    logger.info(f"Uploaded translated file to S3: {output_s3_key}")
-
-    # Generate presigned URL
+    # Presigning is local, so publish the download URL before the upload finishes
     presigned_url = s3_client.generate_presigned_url(
         "get_object",
         Params={"Bucket": BUCKET_NAME, "Key": output_s3_key},
         ExpiresIn=3600,
     )
+    update_job_status(job_id, "UPLOADING", outputS3Key=output_s3_key, downloadUrl=presigned_url)
 
-    # Clean up temp files
-    for f in [tmp_download, tmp_input, tmp_output]:
-        if os.path.exists(f):
-            os.remove(f)
+    output_buffer.seek(0)
+    s3_client.upload_fileobj(output_buffer, BUCKET_NAME, output_s3_key, Config=S3_TRANSFER_CONFIG)
+    logger.info(f"Uploaded translated file to S3: {output_s3_key}")
 
-    # Clean up S3 work data
-    cleanup_work_data(job_id)
+    # Clean up S3 work data in the background; it is not needed for the result
+    cleanup_thread = threading.Thread(target=cleanup_work_data, args=(job_id,))
+    cleanup_thread.start()
 
     # Update final stats
     stats["translatedCells"] = translated_count
-    stats["sheetsProcessed"] = len(wb.worksheets)
+    stats["sheetsProcessed"] = sheets_processed
 
     # Update job status to COMPLETED
     update_job_status(
@@ -252,6 +321,9 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
 
     logger.info(f"Translation job {job_id} completed successfully")
 
+    # The execution environment is frozen after returning, so finish the cleanup first
+    cleanup_thread.join()
+
     return {
         "jobId": job_id,
         "outputS3Key": output_s3_key,
@@ -9,52 +9,114 @@ This Lambda:
 5. Returns batch info for Step Functions Map state
 """
 
-import json
+import base64
+import functools
+import io
 import os
-import uuid
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, BinaryIO
 
 import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from openpyxl import load_workbook
-import re
-
-# For .xls support
-import xlrd
 from openpyxl import Workbook
+import re
+import string
 
 logger = Logger()
 
-s3_client = boto3.client("s3")
-dynamodb_client = boto3.client("dynamodb")
+# Shared by all clients: TCP keepalive keeps pooled connections usable across the long pauses
+# between calls, and standard retry mode backs off with jitter
+AWS_CLIENT_CONFIG = Config(tcp_keepalive=True, retries={"max_attempts": 5, "mode": "standard"})
+
+# Enough pooled connections for the multipart download and the parallel batch writes
+s3_client = boto3.client("s3", config=AWS_CLIENT_CONFIG.merge(Config(max_pool_connections=32)))
 
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "")
 JOB_TABLE_NAME = os.environ.get("JOB_TABLE_NAME", "")
-BATCH_SIZE = 100  # Texts per batch
+job_table = boto3.resource("dynamodb", config=AWS_CLIENT_CONFIG).Table(JOB_TABLE_NAME)
+
+# Batch objects and the work data are written in parallel
+MAX_S3_WRITE_CONCURRENCY = 16
+
+# Small jobs pass all batch texts and the work data inline in the state instead of through S3.
+# Half of the 256 KiB Step Functions payload limit; the rest is headroom for the other state fields
+INLINE_PAYLOAD_BUDGET = 128 * 1024
+# Estimated state bytes per batch besides its texts: batchId/batchKey/textCount and its Map result
+INLINE_BATCH_METADATA_BYTES = 230
+
+# Packed cell arrays are little-endian unsigned 32-bit integers, whatever the host platform
+PACKED_TYPECODE = "I"
+PACKED_ITEMSIZE = 4
+
+# Files are streamed through memory; multipart with parallel parts for large workbooks
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    io_chunksize=1024 * 1024,
+)
+
+# Batch packing: texts per batch are limited by estimated tokens (input + 2x output)
+BATCH_TOKEN_BUDGET = 6000
+BATCH_MAX_TEXTS = 100
+BATCH_ITEM_OVERHEAD_TOKENS = 10  # JSON id/field wrapping per item
+# Long texts are packed first so their batches do not become the tail of the Map state
+HEAVY_TEXT_CHARS = 500
+
+# Source languages written in non-Latin scripts (ASCII-only cells have nothing to translate)
+NON_LATIN_SOURCE_LANGUAGES = {"Japanese", "Chinese", "Korean"}
+
+# Values that never need translation, checked with a single precompiled match per text.
+# Only values containing letters get here (plain numbers, numeric dates and currency amounts are
+# already skipped by the no-letter check), so just those patterns remain, literal prefixes first
+SKIP_TEXT_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            r"/",  # Unix file paths
+            r"(?i:https?://)",  # URLs
+            r"[A-Za-z]:\\",  # Windows file paths
+            r"\d{4}年\d{1,2}月\d{1,2}日$",  # 2024年1月15日
+            r"\d{1,2}:\d{2}(?::\d{2})?\s*[APap][Mm]$",  # Times with AM/PM
+            r"[\d,]+\.?\d*\s*円$",  # Yen amounts
+            r"[\w\.-]+@[\w\.-]+\.\w+$",  # Email addresses
+        )
+    )
+)
+# Every SKIP_TEXT_RE pattern needs one of these characters, so text without them skips the match
+SKIP_TEXT_RE_CHARS = frozenset("/:年円@")
+# Letters, digits, common punctuation and any whitespace (including e.g. the ideographic space);
+# a set lookup per character is cheaper than matching a character-class regex
+ASCII_TEXT_CHARS = frozenset(string.ascii_letters + string.digits + ".,;:!?'\"()-_@#$%&*+=/<>\\|{}[]`~") | {
+    chr(c) for c in range(0x3001) if chr(c).isspace()
+}
+IDENTIFIER_RE = re.compile(r"[A-Z][A-Za-z0-9_]+$|[a-z_][a-z0-9_]*$")  # CamelCase / snake_case
 
 
 def update_job_status(job_id: str, status: str, **kwargs) -> None:
-    """Update job status in DynamoDB"""
+    """Update job status in DynamoDB (dicts are stored as native maps, ints as numbers)"""
     if not JOB_TABLE_NAME or not job_id:
         return
 
     update_expr = "SET #status = :status"
     expr_names = {"#status": "status"}
-    expr_values = {":status": {"S": status}}
+    expr_values: dict[str, Any] = {":status": status}
 
     for key, value in kwargs.items():
         update_expr += f", {key} = :{key}"
-        if isinstance(value, dict):
-            expr_values[f":{key}"] = {"S": json.dumps(value)}
-        else:
-            expr_values[f":{key}"] = {"S": str(value)}
+        expr_values[f":{key}"] = value
 
     try:
-        dynamodb_client.update_item(
-            TableName=JOB_TABLE_NAME,
-            Key={"jobId": {"S": job_id}},
+        job_table.update_item(
+            Key={"jobId": job_id},
             UpdateExpression=update_expr,
             ExpressionAttributeNames=expr_names,
             ExpressionAttributeValues=expr_values,
@@ -63,36 +125,47 @@ def update_job_status(job_id: str, status: str, **kwargs) -> None:
         logger.warning(f"Failed to update job status: {e}")
 
 
-def convert_xls_to_xlsx(xls_path: str, xlsx_path: str) -> None:
-    """Convert .xls file to .xlsx format."""
-    xls_book = xlrd.open_workbook(xls_path, formatting_info=False)
-    xlsx_book = Workbook()
+def convert_xls_value(value: Any, ctype: int, datemode: int) -> Any:
+    """Map an xlrd cell value to the value openpyxl should store"""
+    import xlrd  # Already loaded by convert_xls_to_xlsx
+
+    if ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate.xldate_as_datetime(value, datemode)
+        except Exception:
+            return value
+    if ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    if ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    return value
 
-    if "Sheet" in xlsx_book.sheetnames:
-        del xlsx_book["Sheet"]
+
+def convert_xls_to_xlsx(xls_data: bytes, xlsx_file: BinaryIO) -> None:
+    """Convert .xls file contents to .xlsx format, writing to a file-like object."""
+    # xlrd is only needed for .xls inputs, so keep it out of the cold start of every invocation
+    import xlrd
+
+    # xlrd cell types whose values openpyxl can store unchanged
+    plain_cell_types = frozenset((xlrd.XL_CELL_TEXT, xlrd.XL_CELL_NUMBER))
+
+    xls_book = xlrd.open_workbook(file_contents=xls_data, formatting_info=False)
+    # Write-only mode streams rows out instead of building a Cell grid
+    xlsx_book = Workbook(write_only=True)
 
     for sheet_idx in range(xls_book.nsheets):
         xls_sheet = xls_book.sheet_by_index(sheet_idx)
         xlsx_sheet = xlsx_book.create_sheet(title=xls_sheet.name)
 
         for row_idx in range(xls_sheet.nrows):
-            for col_idx in range(xls_sheet.ncols):
-                cell = xls_sheet.cell(row_idx, col_idx)
-                value = cell.value
-
-                if cell.ctype == xlrd.XL_CELL_DATE:
-                    try:
-                        value = xlrd.xldate.xldate_as_datetime(cell.value, xls_book.datemode)
-                    except Exception:
-                        pass
-                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
-                    value = bool(cell.value)
-                elif cell.ctype == xlrd.XL_CELL_ERROR:
-                    value = None
+            # Text and numbers are copied as-is; only the other cell types need converting
+            values = xls_sheet.row_values(row_idx)
+            for col_idx, ctype in enumerate(xls_sheet.row_types(row_idx)):
+                if ctype not in plain_cell_types:
+                    values[col_idx] = convert_xls_value(values[col_idx], ctype, xls_book.datemode)
+            xlsx_sheet.append(values)
 
-                xlsx_sheet.cell(row=row_idx + 1, column=col_idx + 1, value=value)
-
-    xlsx_book.save(xlsx_path)
+    xlsx_book.save(xlsx_file)
 
 
 def is_xls_file(filename: str) -> bool:
@@ -100,6 +173,9 @@ def is_xls_file(filename: str) -> bool:
     return filename.lower().endswith(".xls") and not filename.lower().endswith(".xlsx")
 
 
+# Pure function of the text; the cache lives as long as the warm container, so labels and
+# headers repeated across jobs are only checked once
+@functools.lru_cache(maxsize=65536)
 def should_skip_text(text: str) -> bool:
     """Check if text should be skipped from translation."""
     text = text.strip()
@@ -107,77 +183,78 @@ def should_skip_text(text: str) -> bool:
     if not text:
         return True
 
-    # Numbers only
-    if re.match(r'^-?[\d,\s]+\.?\d*%?$', text):
+    # No letters at all; this also covers plain numbers, dates, currency values and phone numbers
+    if not any(map(str.isalpha, text)):
+        return True
+
+    # Dates with 年月日, times with AM/PM, URLs, emails, 円 values and file paths
+    if not SKIP_TEXT_RE_CHARS.isdisjoint(text) and SKIP_TEXT_RE.match(text):
         return True
 
-    # Date patterns
-    date_patterns = [
-        r'^\d{4}[-/]\d{1,2}[-/]\d{1,2}$',
-        r'^\d{1,2}[-/]\d{1,2}[-/]\d{4}$',
-        r'^\d{1,2}[-/]\d{1,2}[-/]\d{2}$',
-        r'^\d{4}年\d{1,2}月\d{1,2}日$',
-    ]
-    for pattern in date_patterns:
-        if re.match(pattern, text):
+    # ASCII-only short text and identifiers
+    if ASCII_TEXT_CHARS.issuperset(text):
+        if len(text.split()) <= 2:
+            return True
+        if IDENTIFIER_RE.match(text):
             return True
 
-    # Time patterns
-    if re.match(r'^\d{1,2}:\d{2}(:\d{2})?(\s*[APap][Mm])?$', text):
-        return True
+    return False
 
-    # URLs
-    if re.match(r'^https?://', text, re.IGNORECASE):
-        return True
 
-    # Email addresses
-    if re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', text):
-        return True
+def is_text_value(value: str) -> bool:
+    """Check if a string cell value is non-blank, non-formula text"""
+    # isspace() answers "blank?" without the copy strip() makes
+    return bool(value) and value[0] != "=" and not value.isspace()
 
-    # Phone numbers
-    if re.match(r'^[\d\s\-\+\(\)]+$', text) and len(re.sub(r'\D', '', text)) >= 7:
-        return True
 
-    # Symbols only
-    if not any(c.isalpha() for c in text):
-        return True
+def put_json_object(key: str, body: bytes) -> None:
+    """Store a serialized JSON document in the work bucket"""
+    s3_client.put_object(
+        Bucket=BUCKET_NAME,
+        Key=key,
+        Body=body,
+        ContentType="application/json"
+    )
 
-    # Currency values
-    if re.match(r'^[$€£¥₩]\s*[\d,]+\.?\d*$', text):
-        return True
-    if re.match(r'^[\d,]+\.?\d*\s*[$€£¥₩円]$', text):
-        return True
 
-    # ASCII-only short text
-    if re.match(r'^[A-Za-z0-9\s\.,;:!?\'"()\-_@#$%&*+=/<>\\|{}\[\]`~]+$', text):
-        words = text.split()
-        if len(words) <= 2:
-            return True
-        if re.match(r'^[A-Z][A-Za-z0-9_]+$', text):
-            return True
-        if re.match(r'^[a-z_][a-z0-9_]*$', text):
-            return True
+def pack_array(values: array) -> str:
+    """Base64 of an array's values as little-endian unsigned 32-bit integers"""
+    if values.typecode != PACKED_TYPECODE or values.itemsize != PACKED_ITEMSIZE:
+        raise ValueError(f"Cannot pack array of type {values.typecode!r} ({values.itemsize} bytes per item)")
+    if sys.byteorder == "big":
+        values = array(PACKED_TYPECODE, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
 
-    # File paths
-    if re.match(r'^[A-Za-z]:\\', text) or text.startswith('/'):
-        return True
 
-    return False
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~1 token per CJK character, ~3 ASCII characters per token"""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def pack_batches(texts: list[str]) -> list[list[str]]:
+    """
+    Greedily pack texts into batches sized by estimated tokens rather than a fixed count.
+    Many short cells share one request, while long cells get smaller batches so the
+    response stays well below maxTokens.
+    """
+    batches = []
+    current: list[str] = []
+    current_tokens = 0
 
+    for text in texts:
+        # Input tokens plus ~2x for the translated output, including the JSON wrapping per item
+        tokens = 3 * (estimate_tokens(text) + BATCH_ITEM_OVERHEAD_TOKENS)
+        if current and (current_tokens + tokens > BATCH_TOKEN_BUDGET or len(current) >= BATCH_MAX_TEXTS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
 
-def is_translatable_cell(cell) -> bool:
-    """Check if a cell contains translatable text"""
-    if cell.value is None:
-        return False
-    if not isinstance(cell.value, str):
-        return False
-    if not cell.value.strip():
-        return False
-    if str(cell.value).startswith("="):
-        return False
-    if should_skip_text(cell.value):
-        return False
-    return True
+    if current:
+        batches.append(current)
+    return batches
 
 
 @logger.inject_lambda_context
@@ -196,10 +273,11 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     Output:
     {
         "jobId": "uuid",
-        "workDataKey": "excel-work/jobId/work_data.json",
+        "workDataKey": "excel-work/jobId/work_data.json",  # null when the job is inline
+        "workData": null,  # the work data itself when the job is inline
         "batches": [
-            {"batchId": 0, "batchKey": "excel-work/jobId/batch_0.json"},
-            {"batchId": 1, "batchKey": "excel-work/jobId/batch_1.json"},
+            # inline jobs carry "batchKey": null and the batch "texts" instead
+            {"batchId": 0, "batchKey": "excel-work/jobId/batch_0.json", "texts": null, "textCount": 100},
             ...
         ],
         "sourceLanguage": "Japanese",
@@ -216,111 +294,157 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
 
     update_job_status(job_id, "PREPARING")
 
-    # Download file
+    # Download file into memory
     filename = os.path.basename(s3_key)
     is_xls = is_xls_file(filename)
-    unique_id = uuid.uuid4()
 
-    if is_xls:
-        tmp_download = f"/tmp/input_{unique_id}.xls"
-        tmp_input = f"/tmp/input_{unique_id}_converted.xlsx"
-    else:
-        tmp_download = f"/tmp/input_{unique_id}.xlsx"
-        tmp_input = tmp_download
-
-    s3_client.download_file(BUCKET_NAME, s3_key, tmp_download)
+    download_buffer = io.BytesIO()
+    s3_client.download_fileobj(BUCKET_NAME, s3_key, download_buffer, Config=S3_TRANSFER_CONFIG)
     logger.info(f"Downloaded file from S3: {s3_key}")
 
     if is_xls:
-        convert_xls_to_xlsx(tmp_download, tmp_input)
+        input_buffer = io.BytesIO()
+        convert_xls_to_xlsx(download_buffer.getvalue(), input_buffer)
         logger.info("Converted .xls to .xlsx")
-
-    # Load workbook and extract data
-    wb = load_workbook(tmp_input)
-
-    # Collect all cells info and unique texts
-    all_cells_info = []  # [(sheet_name, coord, text), ...]
-    unique_texts = set()
+    else:
+        input_buffer = download_buffer
+    input_buffer.seek(0)
+
+    # Only values are needed here, so stream the workbook without building Cell objects/styles
+    wb = load_workbook(input_buffer, read_only=True)
+
+    # Collect translatable cells per sheet as parallel typed arrays (a few bytes per cell rather than
+    # a Python int object each); cells refer to their text by its index in the unique text list,
+    # so each string is stored once in the work data
+    sheet_cells = []  # [{"rows": ..., "cols": ..., "textIds": ...}, ...] in worksheet order, packed
+    text_ids: dict[str, int] = {}
+    translatable_count = 0
     total_cell_count = 0
+    skipped_count = 0
+    # ASCII-only text cannot contain a non-Latin source language, so it is already "translated"
+    skip_ascii = source_lang in NON_LATIN_SOURCE_LANGUAGES
+    # Cells repeat the same strings, so run the skip checks once per distinct text
+    skip_decisions: dict[str, bool] = {}
 
     for sheet in wb.worksheets:
-        for row in sheet.iter_rows():
-            for cell in row:
-                total_cell_count += 1
-                if is_translatable_cell(cell):
-                    text = cell.value
-                    all_cells_info.append({
-                        "sheet": sheet.title,
-                        "coord": cell.coordinate,
-                        "text": text
-                    })
-                    unique_texts.add(text)
-
-    unique_texts_list = list(unique_texts)
-    logger.info(f"Found {len(all_cells_info)} translatable cells with {len(unique_texts_list)} unique texts")
-
-    # Split unique texts into batches
-    batches = []
-    work_prefix = f"excel-work/{job_id}"
+        # The declared dimension can be inflated (e.g. A1:XFD1048576), and iter_rows pads every row
+        # out to it; walk only the stored cells and size the grid from what was actually seen
+        sheet.reset_dimensions()
+        max_row = 0
+        max_col = 0
+        rows = array(PACKED_TYPECODE)
+        cols = array(PACKED_TYPECODE)
+        ids = array(PACKED_TYPECODE)
+        for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            if row:
+                max_row = row_idx
+                max_col = max(max_col, len(row))
+            for col_idx, text in enumerate(row, start=1):
+                # Most cells are empty or numeric; reject them before the full text checks
+                if not (isinstance(text, str) and is_text_value(text)):
+                    continue
+                skip = skip_decisions.get(text)
+                if skip is None:
+                    skip = skip_decisions[text] = (skip_ascii and text.isascii()) or should_skip_text(text)
+                if skip:
+                    skipped_count += 1
+                    continue
+                text_id = text_ids.get(text)
+                if text_id is None:
+                    text_id = text_ids[text] = len(text_ids)
+                rows.append(row_idx)
+                cols.append(col_idx)
+                ids.append(text_id)
+        sheet_cells.append({"rows": pack_array(rows), "cols": pack_array(cols), "textIds": pack_array(ids)})
+        translatable_count += len(rows)
+        total_cell_count += max_row * max_col
+    wb.close()
+
+    unique_texts_list = list(text_ids)
+    logger.info(
+        f"Found {translatable_count} translatable cells with {len(unique_texts_list)} unique texts "
+        f"({skipped_count} text cells skipped)"
+    )
 
-    for i in range(0, len(unique_texts_list), BATCH_SIZE):
-        batch_texts = unique_texts_list[i:i + BATCH_SIZE]
-        batch_id = i // BATCH_SIZE
-        batch_key = f"{work_prefix}/batch_{batch_id}.json"
-
-        # Store batch in S3
-        s3_client.put_object(
-            Bucket=BUCKET_NAME,
-            Key=batch_key,
-            Body=json.dumps({"texts": batch_texts}),
-            ContentType="application/json"
-        )
+    # Split unique texts into token-sized batches.
+    # Heavy batches go first so they do not become the tail of the Map state.
+    heavy_texts = [text for text in unique_texts_list if len(text) > HEAVY_TEXT_CHARS]
+    light_texts = [text for text in unique_texts_list if len(text) <= HEAVY_TEXT_CHARS]
+    batch_texts_list = pack_batches(heavy_texts + light_texts)
 
-        batches.append({
-            "batchId": batch_id,
-            "batchKey": batch_key,
-            "textCount": len(batch_texts)
-        })
+    batches = []
+    work_prefix = f"excel-work/{job_id}"
 
-    # Store work data (cells info) in S3
+    # Work data (cells info) for the merge step
     work_data_key = f"{work_prefix}/work_data.json"
     work_data = {
         "s3Key": s3_key,
-        "inputPath": tmp_input,
-        "cells": all_cells_info,
+        "texts": unique_texts_list,
+        "sheets": sheet_cells,
         "totalCells": total_cell_count,
         "uniqueTexts": len(unique_texts_list),
-        "batchCount": len(batches)
+        "batchCount": len(batch_texts_list)
     }
-    s3_client.put_object(
-        Bucket=BUCKET_NAME,
-        Key=work_data_key,
-        Body=json.dumps(work_data),
-        ContentType="application/json"
+
+    # Decide once per job: either every batch and the work data travel inline in the state,
+    # or all of them are written to S3. Mixing the two would let the state grow past the limit.
+    batch_bodies = [orjson.dumps({"texts": batch_texts}) for batch_texts in batch_texts_list]
+    work_data_body = orjson.dumps(work_data)
+    inline_size = (
+        sum(len(batch_body) for batch_body in batch_bodies)
+        + len(work_data_body)
+        + INLINE_BATCH_METADATA_BYTES * len(batch_bodies)
     )
 
-    # Clean up temp files
-    if is_xls and os.path.exists(tmp_download):
-        os.remove(tmp_download)
-    if os.path.exists(tmp_input):
-        os.remove(tmp_input)
+    if inline_size <= INLINE_PAYLOAD_BUDGET:
+        work_data_key = None
+        for batch_id, batch_texts in enumerate(batch_texts_list):
+            batches.append({
+                "batchId": batch_id,
+                "batchKey": None,
+                "texts": batch_texts,
+                "textCount": len(batch_texts)
+            })
+    else:
+        # Store the work data and every batch concurrently; these are independent small writes,
+        # so latency dominates
+        with ThreadPoolExecutor(max_workers=MAX_S3_WRITE_CONCURRENCY) as executor:
+            futures = [executor.submit(put_json_object, work_data_key, work_data_body)]
+            for batch_id, (batch_texts, batch_body) in enumerate(zip(batch_texts_list, batch_bodies, strict=True)):
+                batch_key = f"{work_prefix}/batch_{batch_id}.json"
+                futures.append(executor.submit(put_json_object, batch_key, batch_body))
+                batches.append({
+                    "batchId": batch_id,
+                    "batchKey": batch_key,
+                    "texts": None,
+                    "textCount": len(batch_texts)
+                })
+
+            # Any failed write fails the step, as before
+            for future in futures:
+                future.result()
 
     stats = {
         "totalCells": total_cell_count,
-        "translatableCells": len(all_cells_info),
+        "translatableCells": translatable_count,
+        "skippedCells": skipped_count,
         "uniqueTexts": len(unique_texts_list),
         "batchCount": len(batches)
     }
 
+    # Batch progress is derived from completedBatches, totalBatches and startTime by the status API
+    start_time = datetime.utcnow().isoformat() + "Z"
     update_job_status(
         job_id,
         "TRANSLATING",
-        progress=json.dumps({
+        progress={
             "phase": "prepared",
             "batches": len(batches),
+            "totalBatches": len(batches),
             "uniqueTexts": len(unique_texts_list),
+            "startTime": start_time,
             "percent": 5
-        })
+        }
     )
 
     logger.info(f"Prepared {len(batches)} batches for translation")
@@ -329,9 +453,10 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         "jobId": job_id,
         "s3Key": s3_key,
         "workDataKey": work_data_key,
+        "workData": None if work_data_key else work_data,
         "batches": batches,
         "totalBatches": len(batches),
-        "startTime": datetime.utcnow().isoformat() + "Z",
+        "startTime": start_time,
         "sourceLanguage": source_lang,
         "targetLanguage": target_lang,
         "stats": stats
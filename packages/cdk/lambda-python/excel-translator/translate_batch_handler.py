@@ -8,32 +8,214 @@ This Lambda:
 4. Returns translation key
 """
 
+import hashlib
+import itertools
 import json
 import os
+import random
+import re
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import boto3
-from botocore.exceptions import ClientError
+import orjson
+from botocore.config import Config
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 logger = Logger()
 
-s3_client = boto3.client("s3")
-bedrock_client = boto3.client("bedrock-runtime", region_name=os.environ.get("MODEL_REGION", "us-east-1"))
-dynamodb_client = boto3.client("dynamodb")
+# Translation cache shared by invocations on the same warm container,
+# one {text: translation} dict per language pair
+translation_cache: dict[tuple[str, str], dict[str, str]] = {}
+TRANSLATION_CACHE_MAX_ENTRIES = 50000  # per language pair
+
+# Shared by all clients: TCP keepalive keeps pooled connections usable across the long pauses
+# between calls, and standard retry mode backs off with jitter
+AWS_CLIENT_CONFIG = Config(tcp_keepalive=True, retries={"max_attempts": 5, "mode": "standard"})
+
+s3_client = boto3.client("s3", config=AWS_CLIENT_CONFIG)
+# Adaptive retry mode backs off on throttling with a client-side rate limiter shared by all threads.
+# A full 16k-token response can take minutes to generate, hence the long read timeout.
+bedrock_client = boto3.client(
+    "bedrock-runtime",
+    region_name=os.environ.get("MODEL_REGION", "us-east-1"),
+    config=AWS_CLIENT_CONFIG.merge(
+        Config(
+            retries={"max_attempts": 8, "mode": "adaptive"},
+            connect_timeout=5,
+            read_timeout=300,
+            max_pool_connections=32,
+        )
+    ),
+)
 
 BUCKET_NAME = os.environ.get("BUCKET_NAME", "")
 MODEL_ID = os.environ.get("MODEL_ID", "us.anthropic.claude-3-5-haiku-20241022-v1:0")
 JOB_TABLE_NAME = os.environ.get("JOB_TABLE_NAME", "")
+dynamodb = boto3.resource("dynamodb", config=AWS_CLIENT_CONFIG)
+job_table = dynamodb.Table(JOB_TABLE_NAME)
+
+# Translations shared across containers and jobs (optional); translation_cache stays in front of it
+TRANSLATION_CACHE_TABLE_NAME = os.environ.get("TRANSLATION_CACHE_TABLE_NAME", "")
+TRANSLATION_CACHE_TTL = 30 * 24 * 60 * 60  # seconds
+# Unprocessed cache keys are retried with capped, jittered exponential backoff, then treated as misses
+TRANSLATION_CACHE_READ_ATTEMPTS = 4
+TRANSLATION_CACHE_BACKOFF_BASE = 0.05  # seconds
+TRANSLATION_CACHE_BACKOFF_MAX = 1.0  # seconds
+
+# Extra converse() arguments shared by every Bedrock call.
+# Latency-optimized inference is only offered for some models and regions
+# (e.g. Claude 3.5 Haiku in us-east-2 via cross-region inference), so it is opt-in.
+CONVERSE_EXTRA_ARGS: dict[str, Any] = {}
+if os.environ.get("BEDROCK_LATENCY_OPTIMIZED") == "1":
+    CONVERSE_EXTRA_ARGS["performanceConfig"] = {"latency": "optimized"}
+
+# Static instructions for batch translation. They are identical for every request, so they
+# go in the system prompt where Bedrock prompt caching can reuse them (BEDROCK_PROMPT_CACHING=1).
+BATCH_TRANSLATION_RULES = """You translate texts extracted from spreadsheet cells.
+
+The input is a JSON object mapping ids to source texts.
+
+IMPORTANT RULES:
+- Return ONLY a valid JSON object mapping every input id to its translation
+- Keep the ids exactly as given
+- Preserve numbers, special characters, and formatting
+- If text contains only numbers/symbols, return as-is
+
+Output format (JSON object only, no other text):
+{"0": "...", "1": "...", ...}"""
+
+BATCH_SYSTEM_PROMPT: list[dict[str, Any]] = [{"text": BATCH_TRANSLATION_RULES}]
+if os.environ.get("BEDROCK_PROMPT_CACHING") == "1":
+    BATCH_SYSTEM_PROMPT.append({"cachePoint": {"type": "default"}})
+
+# One "id": "translation" pair of the batch response, used when the JSON is malformed
+BATCH_ITEM_RE = re.compile(r'"(\d+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# maxTokens is reserved against the tokens-per-minute quota, so size it to the expected output
+BATCH_ITEM_OVERHEAD_TOKENS = 10  # JSON id/field wrapping per item
+BATCH_MIN_OUTPUT_TOKENS = 1024
+BATCH_MAX_OUTPUT_TOKENS = 16384
+
+# Upper bound on concurrent fallback requests per batch; several batches run at once in the Map state
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("MAX_CONCURRENT_REQUESTS", "4"))
+
+
+def trim_translation_cache() -> None:
+    """Drop the oldest in-memory translations so the cache stays bounded across warm invocations"""
+    for language_cache in translation_cache.values():
+        excess = len(language_cache) - TRANSLATION_CACHE_MAX_ENTRIES
+        if excess > 0:
+            # Dicts keep insertion order, so the first keys are the oldest entries
+            for text in list(itertools.islice(language_cache, excess)):
+                del language_cache[text]
+
+
+def get_language_cache(source_lang: str, target_lang: str) -> dict[str, str]:
+    """In-memory translations for a language pair, keyed by the source text itself"""
+    return translation_cache.setdefault((source_lang, target_lang), {})
+
+
+def translation_cache_key(text: str, source_lang: str, target_lang: str) -> str:
+    """Key of a translation in the shared DynamoDB cache"""
+    return hashlib.sha256(f"{source_lang}:{target_lang}:{text}".encode()).hexdigest()
+
+
+def load_shared_translations(texts: list[str], source_lang: str, target_lang: str) -> dict[str, str]:
+    """Look up texts in the shared translation cache with BatchGetItem (100 keys per request)"""
+    if not TRANSLATION_CACHE_TABLE_NAME or not texts:
+        return {}
+
+    texts_by_key = {translation_cache_key(text, source_lang, target_lang): text for text in texts}
+    keys = list(texts_by_key)
+    found = {}
+    try:
+        for i in range(0, len(keys), 100):
+            request = {
+                TRANSLATION_CACHE_TABLE_NAME: {
+                    "Keys": [{"cacheKey": key} for key in keys[i:i + 100]],
+                    "ProjectionExpression": "cacheKey, translation",
+                }
+            }
+            for attempt in range(TRANSLATION_CACHE_READ_ATTEMPTS):
+                if attempt:
+                    # Full jitter over the capped exponential delay, so throttled readers spread out
+                    delay = min(TRANSLATION_CACHE_BACKOFF_MAX, TRANSLATION_CACHE_BACKOFF_BASE * 2**attempt)
+                    time.sleep(random.uniform(0, delay))
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for item in response["Responses"].get(TRANSLATION_CACHE_TABLE_NAME, []):
+                    found[texts_by_key[item["cacheKey"]]] = item["translation"]
+                request = response.get("UnprocessedKeys")
+                if not request:
+                    break
+            else:
+                unprocessed = len(request[TRANSLATION_CACHE_TABLE_NAME]["Keys"])
+                logger.warning(f"Treating {unprocessed} unprocessed shared cache keys as misses")
+    except Exception as e:
+        logger.warning(f"Failed to read shared translation cache: {e}")
+    return found
+
+
+def store_shared_translations(translations: dict[str, str], source_lang: str, target_lang: str) -> None:
+    """Write translations to the shared translation cache with BatchWriteItem"""
+    if not TRANSLATION_CACHE_TABLE_NAME or not translations:
+        return
+
+    expires_at = int(time.time()) + TRANSLATION_CACHE_TTL
+    try:
+        with dynamodb.Table(TRANSLATION_CACHE_TABLE_NAME).batch_writer(overwrite_by_pkeys=["cacheKey"]) as batch:
+            for text, translated in translations.items():
+                batch.put_item(Item={
+                    "cacheKey": translation_cache_key(text, source_lang, target_lang),
+                    "translation": translated,
+                    "ttl": expires_at,
+                })
+    except Exception as e:
+        logger.warning(f"Failed to write shared translation cache: {e}")
+
+
+def parse_batch_response(result: str) -> Any:
+    """Parse the JSON object of a batch response, tolerating text the model appends after it"""
+    try:
+        return orjson.loads(result)
+    except orjson.JSONDecodeError:
+        # raw_decode ignores anything after the object; strict=False accepts raw newlines in strings
+        return json.JSONDecoder(strict=False).raw_decode(result)[0]
+
+
+def extract_batch_items(result: str) -> list[tuple[str, str]]:
+    """Pick out complete "id": "translation" pairs in one scan (e.g. from a truncated response)"""
+    items = []
+    for m in BATCH_ITEM_RE.finditer(result):
+        translated = m.group(2)
+        # Only strings with escapes need decoding; strict=False tolerates raw newlines
+        if "\\" in translated:
+            try:
+                translated = json.loads(f'"{translated}"', strict=False)
+            except json.JSONDecodeError:
+                continue
+        items.append((m.group(1), translated))
+    return items
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~1 token per CJK character, ~3 ASCII characters per token"""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def estimate_max_tokens(texts: list[str]) -> int:
+    """maxTokens for a batch: ~2x the estimated input per item, within fixed bounds"""
+    estimate = sum(2 * (estimate_tokens(text) + BATCH_ITEM_OVERHEAD_TOKENS) for text in texts)
+    return min(BATCH_MAX_OUTPUT_TOKENS, max(BATCH_MIN_OUTPUT_TOKENS, estimate))
 
 
 def translate_texts_batch(
     texts: list[str],
     source_lang: str,
-    target_lang: str,
-    max_retries: int = 5
+    target_lang: str
 ) -> dict[str, str]:
     """
     Translate a batch of texts using Bedrock with JSON format.
@@ -44,145 +226,75 @@ def translate_texts_batch(
 
     translations = {}
 
-    # Create JSON input for structured translation
-    input_data = [{"id": i, "text": text} for i, text in enumerate(texts)]
+    # Ids are implicit in the object keys, so the model does not re-emit field names per item
+    input_data = {str(i): text for i, text in enumerate(texts)}
 
     prompt = f"""Translate the following {source_lang} texts to {target_lang}.
 
-IMPORTANT RULES:
-- Return ONLY a valid JSON array with translations
-- Each item must have "id" (same as input) and "translation" fields
-- Preserve numbers, special characters, and formatting
-- If text contains only numbers/symbols, return as-is
-
 Input:
-{json.dumps(input_data, ensure_ascii=False)}
-
-Output format (JSON array only, no other text):
-[{{"id": 0, "translation": "..."}}, {{"id": 1, "translation": "..."}}, ...]"""
-
-    for attempt in range(max_retries):
-        try:
-            response = bedrock_client.converse(
-                modelId=MODEL_ID,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
-                inferenceConfig={"maxTokens": 16384, "temperature": 0.1},
-            )
-            result = response["output"]["message"]["content"][0]["text"].strip()
-
-            # Parse JSON response
-            if result.startswith("```"):
-                result = result.split("```")[1]
-                if result.startswith("json"):
-                    result = result[4:]
-                result = result.strip()
+{orjson.dumps(input_data).decode()}"""
 
-            try:
-                parsed = json.loads(result)
-                for item in parsed:
-                    idx = item.get("id")
-                    translated = item.get("translation", "")
-                    if idx is not None and 0 <= idx < len(texts):
-                        translations[texts[idx]] = translated
-            except json.JSONDecodeError:
-                # Fallback: try line-by-line parsing
-                logger.warning("JSON parse failed, attempting line-by-line parse")
-                for line in result.split("\n"):
-                    line = line.strip()
-                    if '"id"' in line and '"translation"' in line:
-                        try:
-                            item = json.loads(line.rstrip(","))
-                            idx = item.get("id")
-                            translated = item.get("translation", "")
-                            if idx is not None and 0 <= idx < len(texts):
-                                translations[texts[idx]] = translated
-                        except:
-                            continue
-
-            logger.info(f"Translated {len(translations)}/{len(texts)} texts")
-            return translations
-
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ThrottlingException":
-                if attempt < max_retries - 1:
-                    wait_time = (2 ** (attempt + 1)) + (time.time() % 1)
-                    logger.info(f"Throttled, waiting {wait_time:.1f}s before retry {attempt + 2}/{max_retries}")
-                    time.sleep(wait_time)
-                    continue
-            logger.error(f"Bedrock API error: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Translation error: {e}")
-            raise
+    # Throttling is retried by the client (adaptive retry mode)
+    try:
+        response = bedrock_client.converse(
+            modelId=MODEL_ID,
+            system=BATCH_SYSTEM_PROMPT,
+            messages=[
+                {"role": "user", "content": [{"text": prompt}]},
+                # Prefill the response so the model starts directly with the JSON object
+                {"role": "assistant", "content": [{"text": "{"}]},
+            ],
+            inferenceConfig={"maxTokens": estimate_max_tokens(texts), "temperature": 0.1},
+            **CONVERSE_EXTRA_ARGS,
+        )
+    except Exception as e:
+        logger.error(f"Bedrock API error: {e}")
+        raise
+    result = "{" + response["output"]["message"]["content"][0]["text"]
+
+    cache_read_tokens = response.get("usage", {}).get("cacheReadInputTokens")
+    if cache_read_tokens:
+        logger.info(f"Prompt cache hit: {cache_read_tokens} input tokens read from cache")
+
+    try:
+        items = parse_batch_response(result).items()
+    except (json.JSONDecodeError, AttributeError):
+        logger.warning("JSON parse failed, extracting translations with regex")
+        items = extract_batch_items(result)
+
+    for key, translated in items:
+        idx = int(key) if str(key).isdigit() else -1
+        if 0 <= idx < len(texts) and isinstance(translated, str):
+            translations[texts[idx]] = translated
 
+    logger.info(f"Translated {len(translations)}/{len(texts)} texts")
     return translations
 
 
-def update_batch_progress(job_id: str, total_batches: int, start_time: str | None = None) -> None:
+def update_batch_progress(job_id: str, total_batches: int) -> None:
     """
-    Atomically increment completed batch count and update progress.
-    Uses DynamoDB atomic counter for parallel batch tracking.
+    Atomically increment the completed batch count.
+    Uses a DynamoDB atomic counter for parallel batch tracking; percent and time
+    estimates are derived from it by the status API, so each batch costs one write.
     """
     if not JOB_TABLE_NAME or not job_id:
         return
 
     try:
-        # Atomically increment completedBatches counter
-        response = dynamodb_client.update_item(
-            TableName=JOB_TABLE_NAME,
-            Key={"jobId": {"S": job_id}},
-            UpdateExpression="SET completedBatches = if_not_exists(completedBatches, :zero) + :inc",
-            ExpressionAttributeValues={
-                ":inc": {"N": "1"},
-                ":zero": {"N": "0"},
-            },
+        response = job_table.update_item(
+            Key={"jobId": job_id},
+            UpdateExpression="ADD completedBatches :inc",
+            ExpressionAttributeValues={":inc": 1},
             ReturnValues="UPDATED_NEW"
         )
-
-        completed = int(response["Attributes"]["completedBatches"]["N"])
-
-        # Calculate progress: 5% (prepare) + (completed/total * 85%) during translation
-        progress_percent = 5 + int((completed / total_batches) * 85)
-
-        # Update progress info
-        progress_data = {
-            "phase": "translating",
-            "completedBatches": completed,
-            "totalBatches": total_batches,
-            "percent": progress_percent,
-        }
-
-        # Add elapsed time and estimate if we have start time
-        if start_time:
-            try:
-                start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-                elapsed_seconds = (datetime.now(start_dt.tzinfo) - start_dt).total_seconds()
-                progress_data["elapsedSeconds"] = int(elapsed_seconds)
-
-                if completed > 0:
-                    seconds_per_batch = elapsed_seconds / completed
-                    remaining_batches = total_batches - completed
-                    estimated_remaining = int(seconds_per_batch * remaining_batches)
-                    progress_data["estimatedRemainingSeconds"] = estimated_remaining
-            except Exception as e:
-                logger.warning(f"Failed to calculate time estimates: {e}")
-
-        dynamodb_client.update_item(
-            TableName=JOB_TABLE_NAME,
-            Key={"jobId": {"S": job_id}},
-            UpdateExpression="SET progress = :progress",
-            ExpressionAttributeValues={
-                ":progress": {"S": json.dumps(progress_data)},
-            },
-        )
-
-        logger.info(f"Updated progress: {completed}/{total_batches} batches ({progress_percent}%)")
+        completed = int(response["Attributes"]["completedBatches"])
+        logger.info(f"Updated progress: {completed}/{total_batches} batches")
 
     except Exception as e:
         logger.warning(f"Failed to update batch progress: {e}")
 
 
-def translate_single_text(text: str, source_lang: str, target_lang: str, max_retries: int = 3) -> str:
+def translate_single_text(text: str, source_lang: str, target_lang: str) -> str:
     """Translate a single text as fallback"""
     if not text or not text.strip():
         return text
@@ -190,23 +302,16 @@ def translate_single_text(text: str, source_lang: str, target_lang: str, max_ret
     prompt = f"""Translate to {target_lang}. Output only the translation:
 {text}"""
 
-    for attempt in range(max_retries):
-        try:
-            response = bedrock_client.converse(
-                modelId=MODEL_ID,
-                messages=[{"role": "user", "content": [{"text": prompt}]}],
-                inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
-            )
-            return response["output"]["message"]["content"][0]["text"].strip()
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ThrottlingException" and attempt < max_retries - 1:
-                time.sleep(2 ** (attempt + 1))
-                continue
-            return text
-        except:
-            return text
-
-    return text
+    try:
+        response = bedrock_client.converse(
+            modelId=MODEL_ID,
+            messages=[{"role": "user", "content": [{"text": prompt}]}],
+            inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
+            **CONVERSE_EXTRA_ARGS,
+        )
+        return response["output"]["message"]["content"][0]["text"].strip()
+    except:
+        return text
 
 
 @logger.inject_lambda_context
@@ -217,7 +322,8 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     Input (from Map state):
     {
         "batchId": 0,
-        "batchKey": "excel-work/jobId/batch_0.json",
+        "batchKey": "excel-work/jobId/batch_0.json",  # null when texts are inline
+        "texts": null,  # the batch texts for small jobs
         "textCount": 100,
         "jobId": "uuid",
         "sourceLanguage": "Japanese",
@@ -240,27 +346,56 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     source_lang = event.get("sourceLanguage", "Japanese")
     target_lang = event.get("targetLanguage", "English")
     total_batches = event.get("totalBatches", 1)
-    start_time = event.get("startTime")
 
     logger.info(f"Translating batch {batch_id} for job {job_id}")
+    trim_translation_cache()
 
-    # Load batch from S3
-    response = s3_client.get_object(Bucket=BUCKET_NAME, Key=batch_key)
-    batch_data = json.loads(response["Body"].read().decode("utf-8"))
-    texts = batch_data.get("texts", [])
+    # Small jobs pass the texts inline; otherwise load the batch from S3
+    texts = event.get("texts")
+    if texts is None:
+        response = s3_client.get_object(Bucket=BUCKET_NAME, Key=batch_key)
+        texts = orjson.loads(response["Body"].read()).get("texts", [])
 
     logger.info(f"Loaded {len(texts)} texts from batch {batch_id}")
 
+    # Check cache first
+    translations = {}
+    texts_to_translate = []
+    language_cache = get_language_cache(source_lang, target_lang)
+    for text in texts:
+        if text in language_cache:
+            translations[text] = language_cache[text]
+        else:
+            texts_to_translate.append(text)
+
+    # Then the shared cache, which survives container recycling and is shared by all jobs
+    shared_translations = load_shared_translations(texts_to_translate, source_lang, target_lang)
+    for text, translated in shared_translations.items():
+        language_cache[text] = translated
+    translations.update(shared_translations)
+    texts_to_translate = [text for text in texts_to_translate if text not in shared_translations]
+
+    if translations:
+        logger.info(f"Cache hits: {len(translations)}/{len(texts)} texts")
+
     # Translate batch
-    translations = translate_texts_batch(texts, source_lang, target_lang)
+    batch_translations = translate_texts_batch(texts_to_translate, source_lang, target_lang)
+    for text, translated in batch_translations.items():
+        language_cache[text] = translated
+    translations.update(batch_translations)
+    # The shared cache write is not needed for this batch's result, so it overlaps the remaining work
+    cache_thread = threading.Thread(
+        target=store_shared_translations, args=(batch_translations, source_lang, target_lang)
+    )
+    cache_thread.start()
 
     # Handle any missing translations with individual fallback
     missing = [t for t in texts if t not in translations]
     if missing:
         logger.info(f"Retrying {len(missing)} missing translations individually")
-        for text in missing:
-            translated = translate_single_text(text, source_lang, target_lang)
-            translations[text] = translated
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(missing))) as executor:
+            fallback = executor.map(lambda text: translate_single_text(text, source_lang, target_lang), missing)
+            translations.update(zip(missing, fallback, strict=True))
 
     # Store translations in S3
     work_prefix = f"excel-work/{job_id}"
@@ -269,14 +404,17 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     s3_client.put_object(
         Bucket=BUCKET_NAME,
         Key=translation_key,
-        Body=json.dumps({"translations": translations}, ensure_ascii=False),
+        Body=orjson.dumps({"translations": translations}),
         ContentType="application/json"
     )
 
     logger.info(f"Stored {len(translations)} translations for batch {batch_id}")
 
     # Update progress after batch completion
-    update_batch_progress(job_id, total_batches, start_time)
+    update_batch_progress(job_id, total_batches)
+
+    # The execution environment is frozen after returning, so finish the cache write first
+    cache_thread.join()
 
     return {
         "batchId": batch_id,
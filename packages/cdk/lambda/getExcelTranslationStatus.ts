@@ -1,9 +1,21 @@
 import { APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
-import { DynamoDBClient, GetItemCommand } from '@aws-sdk/client-dynamodb';
+import { DynamoDBClient } from '@aws-sdk/client-dynamodb';
+import { DynamoDBDocumentClient, GetCommand } from '@aws-sdk/lib-dynamodb';
 
-const dynamoClient = new DynamoDBClient({});
+const dynamoClient = DynamoDBDocumentClient.from(new DynamoDBClient({}));
 const JOB_TABLE_NAME = process.env.JOB_TABLE_NAME || '';
 
+// progress/stats are stored as native maps; jobs written before that stored JSON strings
+function parseMapAttribute(value: unknown): Record<string, unknown> | null {
+  if (typeof value === 'string') {
+    return JSON.parse(value);
+  }
+  if (value && typeof value === 'object') {
+    return value as Record<string, unknown>;
+  }
+  return null;
+}
+
 // Convert camelCase stats to snake_case for frontend compatibility
 function convertStats(stats: Record<string, unknown>) {
   return {
@@ -16,6 +28,38 @@ function convertStats(stats: Record<string, unknown>) {
   };
 }
 
+// Batch Lambdas only increment completedBatches; derive the translating progress from it
+function deriveBatchProgress(
+  progress: Record<string, unknown>,
+  completedBatches: number
+): Record<string, unknown> {
+  const totalBatches = Number(progress.totalBatches) || 1;
+  const result: Record<string, unknown> = {
+    ...progress,
+    phase: 'translating',
+    completedBatches,
+    totalBatches,
+    // 5% (prepare) + (completed/total * 85%) during translation
+    percent: 5 + Math.floor((completedBatches / totalBatches) * 85),
+  };
+
+  if (typeof progress.startTime === 'string') {
+    const elapsedSeconds = Math.max(
+      0,
+      (Date.now() - Date.parse(progress.startTime)) / 1000
+    );
+    result.elapsedSeconds = Math.floor(elapsedSeconds);
+    if (completedBatches > 0) {
+      const secondsPerBatch = elapsedSeconds / completedBatches;
+      result.estimatedRemainingSeconds = Math.floor(
+        secondsPerBatch * (totalBatches - completedBatches)
+      );
+    }
+  }
+
+  return result;
+}
+
 // Convert progress info for frontend
 function convertProgress(progress: Record<string, unknown>) {
   const result: Record<string, unknown> = {
@@ -65,11 +109,9 @@ export const handler = async (
 
     // Get job record from DynamoDB
     const result = await dynamoClient.send(
-      new GetItemCommand({
+      new GetCommand({
         TableName: JOB_TABLE_NAME,
-        Key: {
-          jobId: { S: jobId },
-        },
+        Key: { jobId },
       })
     );
 
@@ -85,19 +127,29 @@ export const handler = async (
     }
 
     const item = result.Item;
-    const status = item.status?.S;
+    const status = item.status;
 
     const response: Record<string, unknown> = {
-      jobId: item.jobId?.S,
+      jobId: item.jobId,
       status: status,
-      createdAt: item.createdAt?.S,
+      createdAt: item.createdAt,
     };
 
     // Include progress for all in-progress states
-    if (item.progress?.S) {
+    if (item.progress) {
       try {
-        const rawProgress = JSON.parse(item.progress.S);
-        response.progress = convertProgress(rawProgress);
+        let rawProgress = parseMapAttribute(item.progress);
+        if (
+          rawProgress &&
+          status === 'TRANSLATING' &&
+          item.completedBatches !== undefined
+        ) {
+          rawProgress = deriveBatchProgress(
+            rawProgress,
+            Number(item.completedBatches)
+          );
+        }
+        response.progress = rawProgress ? convertProgress(rawProgress) : null;
       } catch {
         response.progress = null;
       }
@@ -105,20 +157,24 @@ export const handler = async (
 
     // Include additional fields based on status
     if (status === 'COMPLETED') {
-      response.downloadUrl = item.downloadUrl?.S;
-      response.outputS3Key = item.outputS3Key?.S;
-      response.completedAt = item.completedAt?.S;
-      if (item.stats?.S) {
+      response.downloadUrl = item.downloadUrl;
+      response.outputS3Key = item.outputS3Key;
+      response.completedAt = item.completedAt;
+      if (item.stats) {
         try {
-          const rawStats = JSON.parse(item.stats.S);
-          response.stats = convertStats(rawStats);
+          const rawStats = parseMapAttribute(item.stats);
+          response.stats = rawStats ? convertStats(rawStats) : null;
         } catch {
           response.stats = null;
         }
       }
+    } else if (status === 'UPLOADING') {
+      // The URL is presigned before the upload finishes so pollers can get ready
+      response.downloadUrl = item.downloadUrl;
+      response.outputS3Key = item.outputS3Key;
     } else if (status === 'FAILED') {
-      response.error = item.error?.S;
-      response.failedAt = item.failedAt?.S;
+      response.error = item.error;
+      response.failedAt = item.failedAt;
     }
 
     return {
@@ -72,6 +72,7 @@ export interface BackendApiProps {
   readonly table: Table;
   readonly statsTable: Table;
   readonly excelTranslationJobTable: Table;
+  readonly excelTranslationCacheTable: Table;
   readonly knowledgeBaseId?: string;
   readonly agents?: string;
   readonly guardrailIdentify?: string;
@@ -871,6 +872,8 @@ export class Api extends Construct {
           MODEL_REGION: modelRegion,
           MODEL_ID: modelIds.length > 0 ? modelIds[0].modelId : '',
           JOB_TABLE_NAME: excelTranslationJobTable.tableName,
+          TRANSLATION_CACHE_TABLE_NAME:
+            props.excelTranslationCacheTable.tableName,
         },
         vpc,
         securityGroups,
@@ -878,6 +881,9 @@ export class Api extends Construct {
     );
     fileBucket.grantReadWrite(excelTranslateBatchFunction);
     excelTranslationJobTable.grantReadWriteData(excelTranslateBatchFunction);
+    props.excelTranslationCacheTable.grantReadWriteData(
+      excelTranslateBatchFunction
+    );
     excelTranslateBatchFunction.role?.addToPrincipalPolicy(
       new PolicyStatement({
         effect: Effect.ALLOW,
@@ -923,13 +929,24 @@ export class Api extends Construct {
         outputPath: '$.Payload',
       }
     );
+    // Throttling that outlasts the Bedrock client's adaptive retries is retried per batch;
+    // full jitter keeps concurrent batches from retrying in lockstep
+    translateBatchTask.addRetry({
+      errors: ['ThrottlingException', 'ServiceUnavailableException'],
+      interval: Duration.seconds(5),
+      backoffRate: 2,
+      maxAttempts: 4,
+      jitterStrategy: sfn.JitterType.FULL,
+    });
 
     const mapState = new sfn.Map(this, 'TranslateBatches', {
-      maxConcurrency: 5,
+      maxConcurrency: 10,
       itemsPath: '$.batches',
       itemSelector: {
         'batchId.$': '$$.Map.Item.Value.batchId',
         'batchKey.$': '$$.Map.Item.Value.batchKey',
+        // Inline texts of small jobs; null when the batch is stored under batchKey
+        'texts.$': '$$.Map.Item.Value.texts',
         'textCount.$': '$$.Map.Item.Value.textCount',
         'jobId.$': '$.jobId',
         'sourceLanguage.$': '$.sourceLanguage',
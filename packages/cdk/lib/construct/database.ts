@@ -4,6 +4,7 @@ import * as ddb from 'aws-cdk-lib/aws-dynamodb';
 export class Database extends Construct {
   public readonly table: ddb.Table;
   public readonly statsTable: ddb.Table;
+  public readonly excelTranslationCacheTable: ddb.Table;
   public readonly feedbackIndexName: string;
 
   constructor(scope: Construct, id: string) {
@@ -43,8 +44,23 @@ export class Database extends Construct {
       billingMode: ddb.BillingMode.PAY_PER_REQUEST,
     });
 
+    // Shared Excel translation cache, expired through the "ttl" attribute
+    const excelTranslationCacheTable = new ddb.Table(
+      this,
+      'ExcelTranslationCacheTable',
+      {
+        partitionKey: {
+          name: 'cacheKey',
+          type: ddb.AttributeType.STRING,
+        },
+        billingMode: ddb.BillingMode.PAY_PER_REQUEST,
+        timeToLiveAttribute: 'ttl',
+      }
+    );
+
     this.table = table;
     this.statsTable = statsTable;
+    this.excelTranslationCacheTable = excelTranslationCacheTable;
     this.feedbackIndexName = feedbackIndexName;
   }
 }
@@ -28,6 +28,7 @@ type JobStatus =
   | 'TRANSLATING'
   | 'MERGING'
   | 'PROCESSING'
+  | 'UPLOADING'
   | 'COMPLETED'
   | 'FAILED';
 
@@ -299,6 +300,8 @@ const ExcelTranslatePage: React.FC = () => {
         return t('excelTranslate.status.merging');
       case 'PROCESSING':
         return t('excelTranslate.status.processing');
+      case 'UPLOADING':
+        return t('excelTranslate.status.uploading');
       default:
         return t('excelTranslate.translateButton');
     }